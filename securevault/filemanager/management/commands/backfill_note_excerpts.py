@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from filemanager.models import Note, make_excerpt
+from filemanager.utils.cache import bump_user_generation
+from filemanager.utils.encryption import decrypt_text
+
+
+class Command(BaseCommand):
+    help = "Populate the encrypted excerpt of notes saved before excerpts existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        total = 0
+        last_pk = None
+        while True:
+            rows = Note.objects.filter(excerpt="").exclude(content="").order_by("pk")
+            if last_pk is not None:
+                rows = rows.filter(pk__gt=last_pk)
+            batch = list(rows.only("pk", "content", "owner_id")[:options["batch_size"]])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            for note in batch:
+                try:
+                    plaintext = decrypt_text(note.content)
+                except Exception:
+                    plaintext = note.content
+                note.excerpt = make_excerpt(plaintext)
+            # bulk_update leaves updated_at alone, unlike save()
+            Note.objects.bulk_update(batch, ["excerpt"])
+            for owner_id in {note.owner_id for note in batch}:
+                bump_user_generation(owner_id)
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {total} note excerpt(s)."))
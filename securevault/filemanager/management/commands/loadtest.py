@@ -0,0 +1,58 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from filemanager.utils.loadgen import DEFAULT_MIX, LoadRun, delete_seeded_users, format_summary, seed_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Run an in-process concurrent load test against the WSGI and/or ASGI application "
+        "and report throughput, p50/p99 latency, error and lock-timeout rates per endpoint. "
+        "Creates temporary 'loadtest-*' users and files in the configured database and "
+        "MEDIA_ROOT; point it at a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interface", choices=["wsgi", "asgi", "both"], default="wsgi")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds per interface.")
+        parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests.")
+        parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted URL names, e.g. file_list:3,home:1")
+        parser.add_argument("--users", type=int, default=4)
+        parser.add_argument("--seed-files", type=int, default=20)
+        parser.add_argument("--seed-notes", type=int, default=20)
+        parser.add_argument("--upload-size", type=int, default=64 * 1024, help="Bytes per upload.")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for a repeatable mix.")
+        parser.add_argument("--keep-data", action="store_true", help="Leave the load-test users in place.")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        interfaces = ["wsgi", "asgi"] if options["interface"] == "both" else [options["interface"]]
+        users = seed_users(options["users"], max(options["seed_files"], 1), max(options["seed_notes"], 1))
+        results = {}
+        try:
+            for interface in interfaces:
+                try:
+                    run = LoadRun(
+                        users, options["mix"], options["concurrency"], options["duration"],
+                        max_requests=options["requests"], upload_size=options["upload_size"],
+                        seed=options["seed"],
+                    )
+                except ValueError as e:
+                    raise CommandError(e)
+                if interface == "wsgi":
+                    from securevault.wsgi import application
+                    results[interface] = run.run_wsgi(application)
+                else:
+                    from securevault.asgi import application
+                    results[interface] = run.run_asgi(application)
+        finally:
+            if not options["keep_data"]:
+                delete_seeded_users(users)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            for interface, summary in results.items():
+                self.stdout.write(format_summary(summary, interface) + "\n")
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from filemanager.models import ChangeLogEntry, ChangeLogHorizon
+
+CHANGELOG_RETENTION_DAYS = getattr(settings, "CHANGELOG_RETENTION_DAYS", 90)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact the sync change log to the latest entry per object, and drop "
+        "tombstones older than the retention period. Clients whose cursor "
+        "predates a dropped tombstone are told to resync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=CHANGELOG_RETENTION_DAYS,
+                            help="Keep tombstones for this many days.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        batch_size = options["batch_size"]
+
+        # Superseded entries: the feed collapses them into the newer entry for
+        # the same object anyway, so no cursor can tell they are gone.
+        newer = ChangeLogEntry.objects.filter(
+            owner_id=OuterRef("owner_id"), object_type=OuterRef("object_type"),
+            object_id=OuterRef("object_id"), id__gt=OuterRef("id"),
+        )
+        superseded = 0
+        last_id = 0
+        while True:
+            ids = list(ChangeLogEntry.objects.filter(id__gt=last_id).order_by("id")
+                       .values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            superseded += ChangeLogEntry.objects.filter(
+                id__gte=ids[0], id__lte=last_id).filter(Exists(newer)).delete()[0]
+
+        # Old tombstones: a client still holding an earlier cursor must resync
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        expired = ChangeLogEntry.objects.filter(action=ChangeLogEntry.DELETE, changed_at__lt=cutoff)
+        tombstones = 0
+        while True:
+            with transaction.atomic():
+                batch = list(expired.order_by("id").values_list("id", "owner_id")[:batch_size])
+                if not batch:
+                    break
+                horizons = {}
+                for entry_id, owner_id in batch:
+                    horizons[owner_id] = max(horizons.get(owner_id, 0), entry_id)
+                for owner_id, pruned_through in horizons.items():
+                    horizon, _ = ChangeLogHorizon.objects.get_or_create(owner_id=owner_id)
+                    if pruned_through > horizon.pruned_through:
+                        horizon.pruned_through = pruned_through
+                        horizon.save(update_fields=["pruned_through"])
+                tombstones += ChangeLogEntry.objects.filter(id__in=[e[0] for e in batch]).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {superseded} superseded and {tombstones} expired change log entries."
+        ))
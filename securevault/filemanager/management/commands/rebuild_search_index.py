@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from filemanager.utils.search import rebuild_file_index, fts5_supported
+
+
+class Command(BaseCommand):
+    help = "Drop and rebuild the FTS5 full-text index over file names and descriptions."
+
+    def handle(self, *args, **options):
+        if not fts5_supported(connection):
+            raise CommandError("This database does not support SQLite FTS5; file search uses LIKE instead.")
+        with transaction.atomic():
+            count = rebuild_file_index(connection)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} file(s)."))
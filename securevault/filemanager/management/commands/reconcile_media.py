@@ -0,0 +1,185 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from filemanager.models import UploadedFile
+
+# Directories this deep below MEDIA_ROOT (e.g. files/ab) are scanned as one
+# unit by a worker; everything above them is walked inline.
+SHARD_DEPTH = 2
+
+
+def _sort_key(entry):
+    # Sorting directories as "name/" makes the walk yield paths in plain
+    # string order, the same order SQLite returns them in.
+    return entry.name + "/" if entry.is_dir(follow_symlinks=False) else entry.name
+
+
+def scan_subtree(root, rel):
+    """Return sorted (relative path, size, mtime) for every file under root/rel."""
+    found = []
+    stack = [rel]
+    while stack:
+        current = stack.pop()
+        with os.scandir(os.path.join(root, current)) as it:
+            for entry in it:
+                path = f"{current}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(path)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    found.append((path, st.st_size, st.st_mtime))
+    found.sort()
+    return found
+
+
+def walk_media(root, pool, prefetch):
+    """
+    Yield (relative path, size, mtime) for every file under root in sorted
+    order. Shard directories are scanned in parallel, at most `prefetch`
+    ahead of the consumer, so memory stays bounded by a few shards.
+    """
+    pending = deque()
+
+    def plan(rel, depth):
+        # Sorted sequence of ("file", item) and ("shard", rel) work items
+        with os.scandir(os.path.join(root, rel) if rel else root) as it:
+            entries = sorted(it, key=_sort_key)
+        for entry in entries:
+            path = f"{rel}/{entry.name}" if rel else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if depth + 1 >= SHARD_DEPTH:
+                    yield "shard", path
+                else:
+                    yield from plan(path, depth + 1)
+            elif entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                yield "file", (path, st.st_size, st.st_mtime)
+
+    for kind, item in plan("", 0):
+        pending.append((kind, pool.submit(scan_subtree, root, item) if kind == "shard" else item))
+        while len(pending) > prefetch:
+            yield from _drain(pending.popleft())
+    while pending:
+        yield from _drain(pending.popleft())
+
+
+def _drain(work):
+    kind, item = work
+    if kind == "shard":
+        yield from item.result()
+    else:
+        yield item
+
+
+def stream_rows(batch_size):
+    """Yield (path, size, pk, uploaded_at) for every UploadedFile in (file, pk) keyset order."""
+    rows = UploadedFile.objects.order_by("file", "pk").values_list("file", "size", "pk", "uploaded_at")
+    last = None
+    while True:
+        page = rows if last is None else rows.filter(Q(file__gt=last[0]) | Q(file=last[0], pk__gt=last[2]))
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield from batch
+        last = batch[-1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare MEDIA_ROOT with the UploadedFile table and report orphaned files, "
+        "rows whose file is missing, and size mismatches. Runs in bounded memory by "
+        "merging a sorted parallel directory walk with a keyset-ordered row stream."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix", action="append", choices=["orphans", "missing", "sizes"], default=[],
+            help="Delete orphaned files, delete rows with missing files, or correct sizes. Repeatable.",
+        )
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--grace", type=int, default=3600,
+            help="Ignore files modified and rows created in the last N seconds (uploads in progress).",
+        )
+
+    def handle(self, *args, **options):
+        storage = UploadedFile._meta.get_field("file").storage
+        if not isinstance(storage, FileSystemStorage):
+            raise CommandError("reconcile_media only supports FileSystemStorage.")
+        root = str(storage.location)
+        if not os.path.isdir(root):
+            raise CommandError(f"MEDIA_ROOT {root} does not exist.")
+
+        self.verbosity = options["verbosity"]
+        fix = set(options["fix"])
+        cutoff = time.time() - options["grace"]
+        counts = {"files": 0, "rows": 0, "orphans": 0, "missing": 0, "mismatched": 0}
+        missing_batch = []
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            disk = walk_media(root, pool, prefetch=options["workers"] * 2)
+            rows = stream_rows(options["batch_size"])
+            d, r = next(disk, None), next(rows, None)
+            while d is not None or r is not None:
+                if r is None or (d is not None and d[0] < r[0]):
+                    counts["files"] += 1
+                    if d[2] < cutoff:
+                        counts["orphans"] += 1
+                        self.report("orphan", d[0], f"{d[1]} bytes")
+                        if "orphans" in fix:
+                            storage.delete(d[0])
+                    d = next(disk, None)
+                elif d is None or r[0] < d[0]:
+                    counts["rows"] += 1
+                    # A row this new may belong to an upload whose file was
+                    # written after the walk passed its path
+                    if r[3].timestamp() < cutoff:
+                        counts["missing"] += 1
+                        self.report("missing", r[0] or "(empty)", f"row {r[2]}")
+                        if "missing" in fix:
+                            missing_batch.append((r[2], r[0]))
+                            if len(missing_batch) >= options["batch_size"]:
+                                self.delete_rows(storage, missing_batch)
+                    r = next(rows, None)
+                else:
+                    # Same path: several rows may point at one file
+                    counts["files"] += 1
+                    path, disk_size, _ = d
+                    while r is not None and r[0] == path:
+                        counts["rows"] += 1
+                        if r[1] != disk_size:
+                            counts["mismatched"] += 1
+                            self.report("size", path, f"row {r[2]} says {r[1]}, disk has {disk_size}")
+                            if "sizes" in fix:
+                                UploadedFile.objects.get(pk=r[2]).save(update_fields=["size"])
+                        r = next(rows, None)
+                    d = next(disk, None)
+
+        if missing_batch:
+            self.delete_rows(storage, missing_batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            "Scanned {files} file(s) and {rows} row(s): {orphans} orphaned, "
+            "{missing} missing, {mismatched} size mismatch(es).".format(**counts)
+        ))
+        if fix:
+            self.stdout.write(f"Fixed: {', '.join(sorted(fix))}.")
+
+    def report(self, kind, path, detail):
+        if self.verbosity >= 2:
+            self.stdout.write(f"{kind:<8} {path}  ({detail})")
+
+    def delete_rows(self, storage, missing):
+        """Delete the (pk, path) rows whose file is still absent now."""
+        # The walk may be minutes old; don't drop a row whose file has since appeared
+        pks = [pk for pk, path in missing if not (path and storage.exists(path))]
+        # Per-object delete signals keep caches and the change log in step
+        UploadedFile.objects.filter(pk__in=pks).delete()
+        missing.clear()
@@ -0,0 +1,115 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from filemanager.models import UploadedFile, sharded_path
+from filemanager.utils.cache import bump_user_generation
+from filemanager.utils.sharing import forget_shared_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Move uploaded files into the hash-sharded layout (files/ab/cd/<uuid>). "
+        "Safe to run while the site is live and to re-run after an interruption."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would move.")
+
+    def handle(self, *args, **options):
+        storage = UploadedFile._meta.get_field("file").storage
+        if not isinstance(storage, FileSystemStorage):
+            raise CommandError("shard_media only supports FileSystemStorage.")
+        self.storage = storage
+
+        moved = missing = skipped = 0
+        last_pk = None
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            while True:
+                rows = UploadedFile.objects.order_by("pk")
+                if last_pk is not None:
+                    rows = rows.filter(pk__gt=last_pk)
+                batch = list(rows.values_list("pk", "file", "owner_id")[:options["batch_size"]])
+                if not batch:
+                    break
+                last_pk = batch[-1][0]
+
+                todo = [
+                    (pk, old, sharded_path(pk, old), owner_id)
+                    for pk, old, owner_id in batch
+                    if old and old != sharded_path(pk, old)
+                ]
+                skipped += len(batch) - len(todo)
+                if options["dry_run"]:
+                    for pk, old, new, _ in todo:
+                        self.stdout.write(f"{old} -> {new}")
+                    moved += len(todo)
+                    continue
+
+                linked = [item for item, ok in zip(todo, pool.map(self.link, todo)) if ok]
+                missing += len(todo) - len(linked)
+                done = self.commit_batch(linked)
+                moved += len(done)
+                list(pool.map(self.unlink_old, done))
+
+        verb = "Would move" if options["dry_run"] else "Moved"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {moved} file(s); {skipped} already sharded; {missing} missing on disk."
+        ))
+
+    def link(self, item):
+        """Make the file reachable under its new path as well as the old one."""
+        pk, old, new, _ = item
+        src, dst = self.storage.path(old), self.storage.path(new)
+        if not os.path.exists(src):
+            self.stderr.write(f"Missing file for {pk}: {old}")
+            return False
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if os.path.exists(dst):
+            # Leftover from an interrupted run
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+        return True
+
+    def commit_batch(self, linked):
+        """Point rows at their new paths; rows changed meanwhile are left alone."""
+        done = []
+        with transaction.atomic():
+            for item in linked:
+                pk, old, new, _ = item
+                if UploadedFile.objects.filter(pk=pk, file=old).update(file=new):
+                    done.append(item)
+                else:
+                    os.remove(self.storage.path(new))
+        # .update() skips the model signals, so drop the share mappings here;
+        # they still name the old path, which unlink_old is about to remove.
+        for pk, _, _, _ in done:
+            forget_shared_file(pk)
+        for owner_id in {item[3] for item in done}:
+            bump_user_generation(owner_id)
+        return done
+
+    def unlink_old(self, item):
+        _, old, _, _ = item
+        path = self.storage.path(old)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        # Drop the old per-user directories once they are empty
+        parent = os.path.dirname(path)
+        while parent != str(self.storage.location) and parent.startswith(str(self.storage.location)):
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
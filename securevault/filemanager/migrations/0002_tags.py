@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_tags(apps, schema_editor):
+    """Parse existing comma-separated Note.tags values into Tag/NoteTag rows."""
+    Note = apps.get_model('filemanager', 'Note')
+    Tag = apps.get_model('filemanager', 'Tag')
+    NoteTag = apps.get_model('filemanager', 'NoteTag')
+
+    tags = {}
+    links = []
+    for note_id, owner_id, raw in Note.objects.exclude(tags='').values_list('id', 'owner_id', 'tags').iterator():
+        names = []
+        for part in raw.split(','):
+            name = part.strip().lower()[:50]
+            if name and name not in names:
+                names.append(name)
+        for name in names:
+            tag = tags.get((owner_id, name))
+            if tag is None:
+                tag = tags[(owner_id, name)] = Tag.objects.create(owner_id=owner_id, name=name)
+            tag.note_count += 1
+            links.append(NoteTag(note_id=note_id, tag=tag, owner_id=owner_id))
+
+    Tag.objects.bulk_update(tags.values(), ['note_count'], batch_size=500)
+    NoteTag.objects.bulk_create(links, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filemanager', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('note_count', models.IntegerField(default=0)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NoteTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('note', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='filemanager.note')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='note_links', to='filemanager.tag')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('owner', 'name'), name='unique_tag_per_owner'),
+        ),
+        migrations.AddIndex(
+            model_name='notetag',
+            index=models.Index(fields=['owner', 'tag'], name='notetag_owner_tag_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='notetag',
+            constraint=models.UniqueConstraint(fields=('note', 'tag'), name='unique_note_tag'),
+        ),
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+from django.db import DatabaseError, migrations
+
+# Frozen copy of the index definition at the time of this migration; the live
+# one is in filemanager/utils/search.py, whose post_migrate hook reinstalls
+# the triggers whenever a table rebuild has dropped them.
+INDEX = "filemanager_uploadedfile_fts"
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX} USING fts5(
+        file_id UNINDEXED, owner_id UNINDEXED, name, description,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {INDEX}_ai AFTER INSERT ON filemanager_uploadedfile BEGIN
+        INSERT INTO {INDEX} (file_id, owner_id, name, description)
+        VALUES (new.id, new.owner_id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {INDEX}_ad AFTER DELETE ON filemanager_uploadedfile BEGIN
+        DELETE FROM {INDEX} WHERE file_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {INDEX}_au
+    AFTER UPDATE OF name, description, owner_id ON filemanager_uploadedfile BEGIN
+        DELETE FROM {INDEX} WHERE file_id = old.id;
+        INSERT INTO {INDEX} (file_id, owner_id, name, description)
+        VALUES (new.id, new.owner_id, new.name, new.description);
+    END
+    """,
+    f"""
+    INSERT INTO {INDEX} (file_id, owner_id, name, description)
+    SELECT id, owner_id, name, description FROM filemanager_uploadedfile
+    """,
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {INDEX}_ai",
+    f"DROP TRIGGER IF EXISTS {INDEX}_ad",
+    f"DROP TRIGGER IF EXISTS {INDEX}_au",
+    f"DROP TABLE IF EXISTS {INDEX}",
+]
+
+
+def create_index(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp.fts5_probe")
+        except DatabaseError:
+            # No FTS5 in this SQLite build; search falls back to LIKE.
+            return
+        for sql in DROP_SQL + CREATE_SQL:
+            cursor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in DROP_SQL:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filemanager', '0002_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
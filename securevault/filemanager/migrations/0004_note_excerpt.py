@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filemanager', '0003_file_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='excerpt',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:26
+
+from itertools import islice
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_changelog(apps, schema_editor):
+    """Log one upsert per existing note and file so a since=0 sync sees them."""
+    ChangeLogEntry = apps.get_model('filemanager', 'ChangeLogEntry')
+    existing = [
+        ('file', apps.get_model('filemanager', 'UploadedFile').objects.order_by('uploaded_at')),
+        ('note', apps.get_model('filemanager', 'Note').objects.order_by('updated_at')),
+    ]
+    for object_type, queryset in existing:
+        entries = (
+            ChangeLogEntry(object_type=object_type, object_id=pk, owner_id=owner_id, action='upsert')
+            for pk, owner_id in queryset.values_list('pk', 'owner_id').iterator()
+        )
+        while batch := list(islice(entries, 500)):
+            ChangeLogEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filemanager', '0004_note_excerpt'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_type', models.CharField(choices=[('file', 'File'), ('note', 'Note')], max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('action', models.CharField(choices=[('upsert', 'Created or updated'), ('delete', 'Deleted')], max_length=10)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['owner', 'id'], name='changelog_owner_cursor_idx')],
+            },
+        ),
+        migrations.RunPython(seed_changelog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filemanager', '0005_changelog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['file', 'id'], name='uploadedfile_file_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filemanager', '0007_changelog_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='share_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,13 +1,47 @@
 import os
+import re
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
 from .utils.encryption import encrypt_text, decrypt_text
 
 
+TAG_MAX_LENGTH = 50
+NOTE_EXCERPT_LENGTH = 256
+
+
+def parse_tags(raw: str) -> list:
+    """Split a comma-separated tag string into normalized, unique tag names."""
+    names = []
+    for part in (raw or "").split(","):
+        name = part.strip().lower()[:TAG_MAX_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def sharded_path(file_id, filename):
+    """
+    Storage path for a file: files/<ab>/<cd>/<uuid><ext>, fanned out on the
+    UUID so no directory grows unbounded. Only the extension of the original
+    name is kept; the display name lives in UploadedFile.name.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if not re.fullmatch(r'\.[a-z0-9]{1,10}', ext):
+        ext = ''
+    digest = file_id.hex
+    return f'files/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def make_excerpt(plaintext: str) -> str:
+    """Encrypted first NOTE_EXCERPT_LENGTH characters of a note."""
+    return encrypt_text(plaintext[:NOTE_EXCERPT_LENGTH]) if plaintext else ""
+
+
 def user_upload_path(instance, filename):
     """Generate upload path for user files"""
-    return f'users/{instance.owner.username}/files/{filename}'
+    return sharded_path(instance.id, filename)
 
 
 class UploadedFile(models.Model):
@@ -35,10 +69,16 @@ class UploadedFile(models.Model):
     description = models.TextField(blank=True)
 
     is_public = models.BooleanField(default=False)
+    # Part of every share link's signature; bumped to kill all existing links
+    share_version = models.PositiveIntegerField(default=0)
     download_count = models.IntegerField(default=0)
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            # Keyset scans by storage path (reconcile_media)
+            models.Index(fields=['file', 'id'], name='uploadedfile_file_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.owner.username})"
@@ -47,7 +87,9 @@ class UploadedFile(models.Model):
         if self.file:
             self.size = self.file.size
             self.name = self.name or self.file.name
-        super().save(*args, **kwargs)
+        # Atomic so the change log entry written by post_save commits with the row
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class Note(models.Model):
@@ -61,6 +103,9 @@ class Note(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     tags = models.CharField(max_length=500, blank=True)
+    # Encrypted start of the content, so lists can render without
+    # loading and decrypting the full note
+    excerpt = models.TextField(blank=True)
 
     class Meta:
         ordering = ['-updated_at']
@@ -69,15 +114,68 @@ class Note(models.Model):
         return f"{self.title} ({self.owner.username})"
 
     def save(self, *args, **kwargs):
-        # Encrypt content before saving (if not already encrypted)
-        if self.content:
-            try:
-                # Try decrypting to check if already encrypted
-                decrypt_text(self.content)
-            except Exception:
-                # Only encrypt plaintext
-                self.content = encrypt_text(self.content)
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            # Encrypt content before saving (if not already encrypted)
+            plaintext = ""
+            if self.content:
+                try:
+                    # Try decrypting to check if already encrypted
+                    plaintext = decrypt_text(self.content)
+                except Exception:
+                    # Only encrypt plaintext
+                    plaintext = self.content
+                    self.content = encrypt_text(self.content)
+            self.excerpt = make_excerpt(plaintext)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "excerpt"}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or "tags" in update_fields:
+                self.sync_tags()
+
+    @property
+    def tag_list(self) -> list:
+        """Tags as entered by the user, for display."""
+        return [t.strip() for t in self.tags.split(",") if t.strip()]
+
+    @property
+    def tag_filters(self) -> list:
+        """(label, stored tag name) pairs, so tag links filter on the name actually stored."""
+        return [(label, parse_tags(label)[0]) for label in self.tag_list]
+
+    def sync_tags(self):
+        """Mirror the tags string into NoteTag rows and adjust facet counts."""
+        wanted = set(parse_tags(self.tags))
+        links = self.tag_links.select_related("tag")
+        current = {link.tag.name: link for link in links}
+
+        removed = [current[name] for name in current.keys() - wanted]
+        if removed:
+            NoteTag.objects.filter(pk__in=[link.pk for link in removed]).delete()
+            Tag.objects.filter(pk__in=[link.tag_id for link in removed]).update(
+                note_count=F("note_count") - 1
+            )
+
+        added = wanted - current.keys()
+        if added:
+            tags = [Tag.objects.get_or_create(owner_id=self.owner_id, name=name)[0] for name in added]
+            NoteTag.objects.bulk_create(
+                [NoteTag(note=self, tag=tag, owner_id=self.owner_id) for tag in tags]
+            )
+            Tag.objects.filter(pk__in=[tag.pk for tag in tags]).update(
+                note_count=F("note_count") + 1
+            )
+
+    @property
+    def decrypted_excerpt(self) -> str:
+        """Decrypted excerpt; falls back to the full content for rows not yet backfilled."""
+        if not self.excerpt:
+            return self.decrypted_content[:NOTE_EXCERPT_LENGTH]
+        try:
+            return decrypt_text(self.excerpt)
+        except Exception:
+            return self.excerpt
 
     @property
     def decrypted_content(self) -> str:
@@ -86,90 +184,75 @@ class Note(models.Model):
             return decrypt_text(self.content)
         except Exception:
             return self.content
-import uuid
-from django.db import models
-from django.contrib.auth.models import User
-from .utils.encryption import encrypt_text, decrypt_text
 
 
-def user_upload_path(instance, filename):
-    """Generate upload path for user files"""
-    return f'users/{instance.owner.username}/files/{filename}'
-
+class Tag(models.Model):
+    """A user's tag, with the number of notes carrying it (facet count)"""
 
-class UploadedFile(models.Model):
-    """Model for storing file information"""
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
+    name = models.CharField(max_length=TAG_MAX_LENGTH)
+    note_count = models.IntegerField(default=0)
 
-    FILE_TYPES = [
-        ('document', 'Document'),
-        ('image', 'Image'),
-        ('video', 'Video'),
-        ('audio', 'Audio'),
-        ('archive', 'Archive'),
-        ('other', 'Other'),
-    ]
+    class Meta:
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'name'], name='unique_tag_per_owner'),
+        ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    name = models.CharField(max_length=255)
-    file = models.FileField(upload_to=user_upload_path)
-    file_type = models.CharField(max_length=20, choices=FILE_TYPES, default='other')
-    size = models.BigIntegerField()
-    mime_type = models.CharField(max_length=100, blank=True)
+    def __str__(self):
+        return f"{self.name} ({self.owner.username})"
 
-    owner = models.ForeignKey(User, on_delete=models.CASCADE)
 
-    uploaded_at = models.DateTimeField(auto_now_add=True)
-    description = models.TextField(blank=True)
+class NoteTag(models.Model):
+    """Link between a note and a tag; owner is denormalized for indexed filtering"""
 
-    is_public = models.BooleanField(default=False)
-    download_count = models.IntegerField(default=0)
+    note = models.ForeignKey(Note, on_delete=models.CASCADE, related_name="tag_links")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="note_links")
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
 
     class Meta:
-        ordering = ['-uploaded_at']
+        constraints = [
+            models.UniqueConstraint(fields=['note', 'tag'], name='unique_note_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', 'tag'], name='notetag_owner_tag_idx'),
+        ]
 
-    def __str__(self):
-        return f"{self.name} ({self.owner.username})"
 
-    def save(self, *args, **kwargs):
-        if self.file:
-            self.size = self.file.size
-            self.name = self.name or self.file.name
-        super().save(*args, **kwargs)
+class ChangeLogEntry(models.Model):
+    """Per-user record of file/note writes; the id is the sync cursor"""
 
+    FILE = 'file'
+    NOTE = 'note'
+    OBJECT_TYPES = [(FILE, 'File'), (NOTE, 'Note')]
 
-class Note(models.Model):
-    """Model for storing notes (encrypted at rest)"""
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTIONS = [(UPSERT, 'Created or updated'), (DELETE, 'Deleted')]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    title = models.CharField(max_length=255)
-    content = models.TextField()  # will store encrypted text
+    id = models.BigAutoField(primary_key=True)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
-
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    tags = models.CharField(max_length=500, blank=True)
+    object_type = models.CharField(max_length=10, choices=OBJECT_TYPES)
+    object_id = models.UUIDField()
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    changed_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['-updated_at']
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['owner', 'id'], name='changelog_owner_cursor_idx'),
+            models.Index(fields=['object_id', 'id'], name='changelog_object_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.title} ({self.owner.username})"
+        return f"{self.action} {self.object_type} {self.object_id} ({self.owner_id})"
 
-    def save(self, *args, **kwargs):
-        # Encrypt content before saving (if not already encrypted)
-        if self.content:
-            try:
-                # Try decrypting to check if already encrypted
-                decrypt_text(self.content)
-            except Exception:
-                # Only encrypt plaintext
-                self.content = encrypt_text(self.content)
-        super().save(*args, **kwargs)
 
-    @property
-    def decrypted_content(self) -> str:
-        """Return decrypted text, or raw content if decryption fails."""
-        try:
-            return decrypt_text(self.content)
-        except Exception:
-            return self.content
+class ChangeLogHorizon(models.Model):
+    """Highest change log id pruned for a user; older sync cursors must resync"""
+
+    owner = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    pruned_through = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.owner_id} pruned through {self.pruned_through}"
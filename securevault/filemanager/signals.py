@@ -0,0 +1,86 @@
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import ChangeLogEntry, Note, Tag, UploadedFile
+from .utils.cache import bump_user_generation
+from .utils.search import ensure_file_index
+from .utils.sharing import forget_shared_file
+
+
+# Saving only these fields records usage, not a change to the object
+COUNTER_FIELDS = frozenset({"download_count"})
+
+
+def _counters_only(update_fields):
+    return bool(update_fields) and update_fields <= COUNTER_FIELDS
+
+
+@receiver(post_save, sender=UploadedFile)
+@receiver(post_delete, sender=UploadedFile)
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def invalidate_user_cache(sender, instance, update_fields=None, **kwargs):
+    """Any write to a user's files or notes drops their cached pages."""
+    if _counters_only(update_fields):
+        return
+    owner_id = instance.owner_id
+    # Only after commit: bumping inside the write's transaction would let a
+    # concurrent reader cache the old rows under the new generation.
+    transaction.on_commit(lambda: bump_user_generation(owner_id))
+
+
+@receiver(post_save, sender=UploadedFile)
+@receiver(post_delete, sender=UploadedFile)
+def invalidate_share_mapping(sender, instance, update_fields=None, **kwargs):
+    """Make share links see path changes, unsharing and deletion right away."""
+    if _counters_only(update_fields):
+        return
+    file_id = instance.pk
+    # After commit, or another worker could re-cache the old, still public
+    # row for SHARE_MAPPING_TIMEOUT.
+    transaction.on_commit(lambda: forget_shared_file(file_id))
+
+
+@receiver(pre_delete, sender=Note)
+def release_note_tags(sender, instance, **kwargs):
+    """Decrement facet counts for the tags of a note about to be deleted."""
+    Tag.objects.filter(note_links__note=instance).update(note_count=F("note_count") - 1)
+
+
+def _object_type(sender):
+    return ChangeLogEntry.NOTE if sender is Note else ChangeLogEntry.FILE
+
+
+@receiver(post_save, sender=UploadedFile)
+@receiver(post_save, sender=Note)
+def log_upsert(sender, instance, update_fields=None, **kwargs):
+    if _counters_only(update_fields):
+        return
+    ChangeLogEntry.objects.create(
+        owner_id=instance.owner_id, object_type=_object_type(sender),
+        object_id=instance.pk, action=ChangeLogEntry.UPSERT,
+    )
+
+
+@receiver(post_delete, sender=UploadedFile)
+@receiver(post_delete, sender=Note)
+def log_delete(sender, instance, origin=None, **kwargs):
+    # Nobody is left to sync when the owner account itself is being deleted
+    if isinstance(origin, User) or getattr(origin, "model", None) is User:
+        return
+    ChangeLogEntry.objects.create(
+        owner_id=instance.owner_id, object_type=_object_type(sender),
+        object_id=instance.pk, action=ChangeLogEntry.DELETE,
+    )
+
+
+def ensure_search_index(sender, using="default", **kwargs):
+    """post_migrate receiver (connected in apps.py) restoring the file search triggers."""
+    conn = connections[using]
+    # Respect a migrate back to before the index existed
+    if ("filemanager", "0003_file_search_index") in MigrationRecorder(conn).applied_migrations():
+        ensure_file_index(conn)
@@ -0,0 +1,14 @@
+import shutil
+import tempfile
+
+
+class TempMediaMixin:
+    """Give every test its own empty MEDIA_ROOT, removed afterwards."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = self.settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
@@ -0,0 +1,107 @@
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from filemanager.utils.admission import get_config, get_store
+
+TMP = Path(tempfile.mkdtemp())
+
+
+def limits(**overrides):
+    return {
+        "DB_PATH": TMP / f"admission-{len(list(TMP.iterdir()))}.sqlite3",
+        "USER_REQUESTS_PER_SECOND": 0.01,
+        "USER_REQUEST_BURST": 2,
+        "MAX_CONCURRENT_UPLOADS": 4,
+        "QUEUE_SIZE": 1,
+        "QUEUE_TIMEOUT": 0.1,
+        **overrides,
+    }
+
+
+@override_settings(MEDIA_ROOT=TMP / "media")
+class UploadAdmissionTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TMP, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user("alice", password="pw")
+        self.client.force_login(self.user)
+
+    def upload(self):
+        return self.client.post(
+            reverse("api_upload_file"), {"file": SimpleUploadedFile("a.txt", b"data")}
+        )
+
+    def test_request_rate_limit_returns_429_with_retry_after(self):
+        with self.settings(UPLOAD_ADMISSION=limits()):
+            self.assertTrue(self.upload().json()["success"])
+            self.assertTrue(self.upload().json()["success"])
+            response = self.upload()
+            self.assertEqual(response.status_code, 429)
+            self.assertGreaterEqual(int(response["Retry-After"]), 1)
+            metrics = get_store().metrics()
+        self.assertEqual(metrics["admitted"], 2)
+        self.assertEqual(metrics["rejected_request_rate"], 1)
+        self.assertEqual(metrics["in_flight"], 0)
+
+    def test_global_concurrency_cap_times_out_in_queue(self):
+        with self.settings(UPLOAD_ADMISSION=limits(MAX_CONCURRENT_UPLOADS=1)):
+            config = get_config()
+            held = get_store(config).try_acquire_slot(0, config)
+            response = self.upload()
+            self.assertEqual(response.status_code, 429)
+            get_store(config).release_slot(held)
+            self.assertEqual(self.upload().status_code, 200)
+            metrics = get_store(config).metrics()
+        self.assertEqual(metrics["rejected_queue_timeout"], 1)
+        self.assertEqual(metrics["waiting"], 0)
+
+    def test_rejects_before_csrf_reads_the_body(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        with self.settings(UPLOAD_ADMISSION=limits(USER_REQUEST_BURST=0)), \
+                mock.patch("django.http.request.HttpRequest._load_post_and_files") as load:
+            response = client.post(reverse("upload_file"), {"file": SimpleUploadedFile("a.txt", b"data")})
+        self.assertEqual(response.status_code, 429)
+        load.assert_not_called()
+
+    def test_requires_content_length(self):
+        with self.settings(UPLOAD_ADMISSION=limits()):
+            response = self.client.post(
+                reverse("api_upload_file"), {"file": SimpleUploadedFile("a.txt", b"data")},
+                CONTENT_LENGTH="",
+            )
+            self.assertEqual(response.status_code, 411)
+            self.assertNotIn("admitted", get_store().metrics())
+
+    async def test_queued_upload_under_asgi_leaves_other_requests_running(self):
+        with self.settings(UPLOAD_ADMISSION=limits(MAX_CONCURRENT_UPLOADS=1, QUEUE_TIMEOUT=5)):
+            config = get_config()
+            store = get_store(config)
+            held = store.try_acquire_slot(0, config)
+            await self.async_client.aforce_login(self.user)
+            upload = asyncio.ensure_future(self.async_client.post(
+                reverse("api_upload_file"), {"file": SimpleUploadedFile("a.txt", b"data")}
+            ))
+            while not store.metrics()["waiting"]:
+                await asyncio.sleep(0.01)
+
+            # A sync wait would hold the thread this view needs until the queue timed out
+            response = await asyncio.wait_for(self.async_client.get(reverse("home")), 2)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(upload.done())
+
+            store.release_slot(held)
+            response = await upload
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(store.metrics()["in_flight"], 0)
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from filemanager.models import Note
+from filemanager.utils.cache import bump_user_generation, user_cache_key, user_generation
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'user_data': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-user-data'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-shared'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class UserCacheTests(TestCase):
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        self.user = User.objects.create_user("alice", password="pw")
+        self.client.force_login(self.user)
+
+    def test_writes_bump_generation(self):
+        key = user_cache_key(self.user.pk, "notes")
+        with self.captureOnCommitCallbacks(execute=True):
+            note = Note.objects.create(title="First", content="secret", owner=self.user)
+        self.assertNotEqual(user_cache_key(self.user.pk, "notes"), key)
+        key = user_cache_key(self.user.pk, "notes")
+        with self.captureOnCommitCallbacks(execute=True):
+            note.delete()
+        self.assertNotEqual(user_cache_key(self.user.pk, "notes"), key)
+
+    def test_generation_moves_only_after_commit(self):
+        key = user_cache_key(self.user.pk, "notes")
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Note.objects.create(title="First", content="secret", owner=self.user)
+                # Readers still see committed rows here, so they must keep
+                # caching them under the old generation.
+                self.assertEqual(user_cache_key(self.user.pk, "notes"), key)
+        self.assertNotEqual(user_cache_key(self.user.pk, "notes"), key)
+
+    def test_concurrent_bumps_are_not_lost(self):
+        start = user_generation(self.user.pk)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: bump_user_generation(self.user.pk), range(40)))
+        self.assertEqual(user_generation(self.user.pk), start + 40)
+
+    def test_notes_list_served_from_cache_until_invalidated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(title="First", content="secret", owner=self.user)
+        self.client.get(reverse("notes_list"))
+
+        # A queryset update skips signals, so the cached page is still served.
+        Note.objects.filter(owner=self.user).update(title="Renamed")
+        response = self.client.get(reverse("notes_list"))
+        self.assertEqual(response.context["page_obj"][0].title, "First")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(title="Second", content="more", owner=self.user)
+        response = self.client.get(reverse("notes_list"))
+        self.assertEqual(
+            [n.title for n in response.context["page_obj"]], ["Second", "Renamed"]
+        )
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from filemanager.models import ChangeLogEntry, Note, UploadedFile
+from filemanager.tests import TempMediaMixin
+
+
+class ChangesFeedTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("alice", password="pw")
+        self.client.force_login(self.user)
+
+    def feed(self, **params):
+        return self.client.get(reverse("changes_feed"), params)
+
+    def test_returns_upserts_and_tombstones_since_cursor(self):
+        kept = Note.objects.create(title="Kept", content="hello", owner=self.user)
+        gone = Note.objects.create(title="Gone", content="bye", owner=self.user)
+        cursor = self.feed().json()["cursor"]
+
+        kept.title = "Kept v2"
+        kept.save()
+        gone_id = str(gone.pk)
+        gone.delete()
+
+        data = self.feed(since=cursor).json()
+        self.assertEqual(
+            [(c["id"], c["action"]) for c in data["changes"]],
+            [(str(kept.pk), "upsert"), (gone_id, "delete")],
+        )
+        self.assertEqual(data["changes"][0]["data"]["content"], "hello")
+        self.assertFalse(data["has_more"])
+
+    def test_batches_and_collapses_repeated_changes(self):
+        note = Note.objects.create(title="v1", content="x", owner=self.user)
+        for n in range(2, 5):
+            note.title = f"v{n}"
+            note.save()
+
+        first = self.feed(limit=3).json()
+        self.assertTrue(first["has_more"])
+        self.assertEqual([c["data"]["title"] for c in first["changes"]], ["v4"])
+        rest = self.feed(since=first["cursor"], limit=3).json()
+        self.assertFalse(rest["has_more"])
+        self.assertEqual(len(rest["changes"]), 1)
+
+    def test_not_modified_when_nothing_changed(self):
+        Note.objects.create(title="n", content="x", owner=self.user)
+        response = self.feed()
+        etag = response["ETag"]
+        self.assertEqual(
+            self.client.get(reverse("changes_feed"), HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        Note.objects.create(title="m", content="y", owner=self.user)
+        self.assertEqual(
+            self.client.get(reverse("changes_feed"), HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+
+    def test_deleting_account_skips_tombstones(self):
+        Note.objects.create(title="n", content="x", owner=self.user)
+        self.user.delete()
+        self.assertFalse(ChangeLogEntry.objects.exists())
+
+    def test_downloads_are_not_changes(self):
+        f = UploadedFile.objects.create(
+            name="a.txt", owner=self.user, file=SimpleUploadedFile("a.txt", b"data"),
+        )
+        cursor = self.feed().json()["cursor"]
+        self.client.get(reverse("download_file", args=[f.pk]))
+        f.refresh_from_db()
+        self.assertEqual(f.download_count, 1)
+        self.assertEqual(self.feed(since=cursor).json()["changes"], [])
+
+    def test_prune_compacts_and_expires_old_cursors(self):
+        kept = Note.objects.create(title="v1", content="x", owner=self.user)
+        kept.title = "v2"
+        kept.save()
+        gone = Note.objects.create(title="gone", content="y", owner=self.user)
+        old_cursor = self.feed().json()["cursor"]
+        gone.delete()
+        ChangeLogEntry.objects.filter(action=ChangeLogEntry.DELETE).update(
+            changed_at=timezone.now() - timedelta(days=100)
+        )
+        fresh_cursor = self.feed().json()["cursor"]
+
+        call_command("prune_changelog", days=90, stdout=StringIO())
+        self.assertEqual(
+            list(ChangeLogEntry.objects.values_list("object_id", "action")),
+            [(kept.pk, ChangeLogEntry.UPSERT)],
+        )
+
+        response = self.feed(since=old_cursor)
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.json()["resync"])
+        self.assertEqual(self.feed(since=fresh_cursor).json()["changes"], [])
+        resync = self.feed().json()["changes"]
+        self.assertEqual([c["data"]["title"] for c in resync], ["v2"])
+
+    def test_migration_seeds_existing_objects(self):
+        note = Note.objects.create(title="n", content="x", owner=self.user)
+        f = UploadedFile.objects.create(
+            name="a.txt", owner=self.user, file=SimpleUploadedFile("a.txt", b"data"),
+        )
+        # Rows written before 0005 had no change log entries
+        ChangeLogEntry.objects.all().delete()
+
+        state = MigrationExecutor(connection).loader.project_state(("filemanager", "0005_changelog"))
+        import_module("filemanager.migrations.0005_changelog").seed_changelog(state.apps, None)
+
+        changes = self.feed(since=0).json()["changes"]
+        self.assertEqual(
+            [(c["type"], c["id"], c["action"]) for c in changes],
+            [("file", str(f.pk), "upsert"), ("note", str(note.pk), "upsert")],
+        )
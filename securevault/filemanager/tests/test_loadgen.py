@@ -0,0 +1,44 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from filemanager.tests import TempMediaMixin
+from filemanager.utils.loadgen import USERNAME_PREFIX, parse_mix, percentile
+
+
+class LoadGeneratorTests(TempMediaMixin, TransactionTestCase):
+    def test_parse_mix_rejects_unknown_endpoint(self):
+        self.assertEqual(parse_mix("home:2,file_list"), (["home", "file_list"], [2.0, 1.0]))
+        with self.assertRaises(ValueError):
+            parse_mix("admin:1")
+
+    def test_percentile_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+
+    def test_drives_wsgi_and_asgi(self):
+        out = StringIO()
+        call_command(
+            "loadtest", interface="both", concurrency=1, requests=12, duration=30,
+            mix="home:1,notes_list:1,create_note:1", users=1, seed_files=1, seed_notes=1,
+            seed=1, stdout=out,
+        )
+        report = out.getvalue()
+        self.assertIn("WSGI", report)
+        self.assertIn("ASGI", report)
+        total = [line for line in report.splitlines() if line.startswith("TOTAL")]
+        self.assertEqual(len(total), 2)
+        for line in total:
+            self.assertEqual(line.split()[1], "12")
+            self.assertEqual(line.split()[-2], "0.0%")
+
+    def test_cleanup_removes_only_seeded_users(self):
+        bystander = User.objects.create_user(f"{USERNAME_PREFIX}fan", password="pw")
+        call_command(
+            "loadtest", interface="wsgi", concurrency=1, requests=2, duration=30,
+            mix="home:1", users=2, seed_files=1, seed_notes=1, stdout=StringIO(),
+        )
+        self.assertEqual(list(User.objects.values_list("pk", flat=True)), [bystander.pk])
@@ -0,0 +1,29 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from filemanager.models import NOTE_EXCERPT_LENGTH, Note
+
+
+class NoteExcerptTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("alice", password="pw")
+
+    def test_save_stores_encrypted_excerpt(self):
+        note = Note.objects.create(title="Long", content="x" * 10000, owner=self.user)
+        self.assertNotIn("xxx", note.excerpt)
+        listed = Note.objects.defer("content").get(pk=note.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(listed.decrypted_excerpt, "x" * NOTE_EXCERPT_LENGTH)
+
+    def test_backfill_populates_missing_excerpts(self):
+        note = Note.objects.create(title="Old", content="secret text", owner=self.user)
+        Note.objects.filter(pk=note.pk).update(excerpt="")
+
+        call_command("backfill_note_excerpts", stdout=StringIO())
+
+        note.refresh_from_db()
+        self.assertNotEqual(note.excerpt, "")
+        self.assertEqual(note.decrypted_excerpt, "secret text")
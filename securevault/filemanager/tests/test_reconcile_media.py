@@ -0,0 +1,73 @@
+import os
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from filemanager.management.commands import reconcile_media
+from filemanager.models import UploadedFile
+from filemanager.tests import TempMediaMixin
+
+
+class ReconcileMediaTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        # A fresh MEDIA_ROOT per test, since the walk sees every file in it
+        super().setUp()
+        user = User.objects.create_user("alice", password="pw")
+        self.ok = UploadedFile.objects.create(
+            name="ok.txt", owner=user, file=ContentFile(b"fine", name="ok.txt"))
+        self.resized = UploadedFile.objects.create(
+            name="resized.txt", owner=user, file=ContentFile(b"12345", name="resized.txt"))
+        UploadedFile.objects.filter(pk=self.resized.pk).update(size=1)
+        self.gone = UploadedFile.objects.create(
+            name="gone.txt", owner=user, file=ContentFile(b"bye", name="gone.txt"))
+        default_storage.delete(self.gone.file.name)
+        UploadedFile.objects.filter(pk=self.gone.pk).update(uploaded_at=timezone.now() - timedelta(days=1))
+        self.orphan = default_storage.save("users/alice/files/old.txt", ContentFile(b"left over"))
+        os.utime(default_storage.path(self.orphan), (0, 0))
+
+    def reconcile(self, *args):
+        out = StringIO()
+        call_command("reconcile_media", *args, verbosity=2, stdout=out)
+        return out.getvalue()
+
+    def test_reports_each_kind_of_drift(self):
+        report = self.reconcile()
+        self.assertIn("Scanned 3 file(s) and 3 row(s): 1 orphaned, 1 missing, 1 size mismatch(es).", report)
+        self.assertIn(f"orphan   {self.orphan}", report)
+        self.assertIn(f"missing  {self.gone.file.name}", report)
+
+    def test_fix_repairs_everything(self):
+        self.reconcile("--fix", "orphans", "--fix", "missing", "--fix", "sizes")
+
+        self.assertFalse(default_storage.exists(self.orphan))
+        self.assertFalse(UploadedFile.objects.filter(pk=self.gone.pk).exists())
+        self.resized.refresh_from_db()
+        self.assertEqual(self.resized.size, 5)
+        self.assertIn("0 orphaned, 0 missing, 0 size mismatch(es)", self.reconcile())
+
+    def test_fix_keeps_rows_of_uploads_in_progress(self):
+        fresh = UploadedFile.objects.create(
+            name="fresh.txt", owner=self.ok.owner, file=ContentFile(b"new", name="fresh.txt"))
+        default_storage.delete(fresh.file.name)
+
+        report = self.reconcile("--fix", "missing")
+        self.assertIn("1 missing", report)
+        self.assertTrue(UploadedFile.objects.filter(pk=fresh.pk).exists())
+
+    def test_fix_keeps_rows_whose_file_appears_after_the_walk(self):
+        walk = reconcile_media.walk_media
+
+        def walk_then_restore(*args, **kwargs):
+            yield from walk(*args, **kwargs)
+            default_storage.save(self.gone.file.name, ContentFile(b"bye"))
+
+        with mock.patch.object(reconcile_media, "walk_media", walk_then_restore):
+            self.assertIn("1 missing", self.reconcile("--fix", "missing"))
+        self.assertTrue(UploadedFile.objects.filter(pk=self.gone.pk).exists())
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from filemanager.models import UploadedFile
+from filemanager.tests import TempMediaMixin
+from filemanager.utils.search import FILE_INDEX, build_match_query, count_matching_files, search_files
+
+
+class FileSearchTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("alice", password="pw")
+        self.client.force_login(self.user)
+
+    def upload(self, name, description=""):
+        return UploadedFile.objects.create(
+            name=name, description=description, owner=self.user,
+            file=SimpleUploadedFile(name, b"data"),
+        )
+
+    def test_match_query_quotes_prefix_terms(self):
+        self.assertEqual(build_match_query('quarterly "rep'), '"quarterly"* "rep"*')
+
+    def test_prefix_search_ranks_name_matches_first(self):
+        in_description = self.upload("notes.txt", "draft of the quarterly report")
+        in_name = self.upload("report.pdf")
+        self.upload("photo.png", "holiday")
+
+        hits = search_files(self.user.pk, "rep")
+        self.assertEqual(
+            [hit.file_id for hit in hits], [in_name.pk.hex, in_description.pk.hex]
+        )
+        self.assertIn("<mark>report</mark>", hits[0].name)
+
+    def test_index_follows_updates_and_deletes(self):
+        f = self.upload("old.txt")
+        f.name = "renamed.txt"
+        f.save()
+        self.assertEqual(search_files(self.user.pk, "old"), [])
+        self.assertEqual(len(search_files(self.user.pk, "renamed")), 1)
+        f.delete()
+        self.assertEqual(search_files(self.user.pk, "renamed"), [])
+
+    def test_file_list_falls_back_without_index(self):
+        self.upload("homework.pdf")
+        with mock.patch("filemanager.views.count_matching_files", return_value=None):
+            response = self.client.get(reverse("file_list"), {"search": "ework"})
+        self.assertEqual([f.name for f in response.context["page_obj"]], ["homework.pdf"])
+
+    def test_file_list_pages_through_every_match(self):
+        for i in range(30):
+            self.upload(f"report-{i:02}.txt")
+        self.upload("photo.png")
+        self.assertEqual(count_matching_files(self.user.pk, "report"), 30)
+
+        for sort in ("relevance", "name"):
+            seen = []
+            for page in (1, 2, 3):
+                response = self.client.get(reverse("file_list"), {"search": "report", "sort": sort, "page": page})
+                page_obj = response.context["page_obj"]
+                self.assertEqual(page_obj.paginator.count, 30)
+                self.assertTrue(all(f.search_hit for f in page_obj))
+                seen += [f.name for f in page_obj]
+            self.assertEqual(sorted(seen), [f"report-{i:02}.txt" for i in range(30)])
+
+    def test_post_migrate_restores_dropped_triggers(self):
+        # What SQLite does when a migration rebuilds the table
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {FILE_INDEX}_ai")
+        self.upload("missed.txt")
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        self.assertEqual(len(search_files(self.user.pk, "missed")), 1)
+        self.upload("later.txt")
+        self.assertEqual(len(search_files(self.user.pk, "later")), 1)
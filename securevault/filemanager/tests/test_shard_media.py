@@ -0,0 +1,52 @@
+import os
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from filemanager.models import UploadedFile, sharded_path
+from filemanager.tests import TempMediaMixin
+
+
+class ShardMediaTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("alice", password="pw")
+
+    def test_sharded_path_keeps_only_extension(self):
+        f = UploadedFile(name="Q3 Report.PDF", owner=self.user)
+        h = f.id.hex
+        self.assertEqual(sharded_path(f.id, "Q3 Report.PDF"), f"files/{h[:2]}/{h[2:4]}/{h}.pdf")
+
+    def test_moves_legacy_files(self):
+        old = default_storage.save("users/alice/files/report.txt", ContentFile(b"hello"))
+        f = UploadedFile.objects.create(name="report.txt", file=old, owner=self.user)
+
+        call_command("shard_media", stdout=StringIO())
+
+        f.refresh_from_db()
+        self.assertEqual(f.file.name, sharded_path(f.id, "report.txt"))
+        self.assertEqual(f.file.read(), b"hello")
+        self.assertFalse(default_storage.exists(old))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, "users", "alice")))
+
+    def test_share_links_survive_the_move(self):
+        old = default_storage.save("users/alice/files/report.txt", ContentFile(b"hello"))
+        f = UploadedFile.objects.create(name="report.txt", file=old, owner=self.user)
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            url = self.client.post(reverse("share_file", args=[f.pk])).json()["url"]
+        self.client.logout()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+        call_command("shard_media", stdout=StringIO())
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"hello")
@@ -0,0 +1,83 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from filemanager.models import UploadedFile
+from filemanager.tests import TempMediaMixin
+from filemanager.utils.sharing import make_share_path, resolve_shared_file, sign_share
+
+
+class ShareLinkTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("alice", password="pw")
+        self.file = UploadedFile.objects.create(
+            name="report.txt", owner=self.user, mime_type="text/plain",
+            file=SimpleUploadedFile("report.txt", b"shared bytes"),
+        )
+
+    def share(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            data = self.client.post(reverse("share_file", args=[self.file.pk])).json()
+        self.client.logout()
+        return data["url"]
+
+    def unshare(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("unshare_file", args=[self.file.pk]))
+        self.client.logout()
+
+    def test_link_serves_file_without_login_or_queries(self):
+        url = self.share()
+        response = self.client.get(url)
+        self.assertEqual(b"".join(response.streaming_content), b"shared bytes")
+        self.assertTrue(response["Cache-Control"].startswith("public, max-age="))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_rejects_tampered_and_expired_links(self):
+        self.share()
+        self.file.refresh_from_db()
+        path, expires = make_share_path(self.file.pk, self.file.share_version)
+        self.assertEqual(self.client.get(path.replace(str(expires), str(expires + 3600))).status_code, 404)
+
+        expired = int(time.time()) - 1
+        stale = reverse("shared_file", args=[self.file.pk, expired, sign_share(self.file.pk, self.file.share_version, expired)])
+        self.assertEqual(self.client.get(stale).status_code, 404)
+
+    def test_unsharing_revokes_cached_links(self):
+        url = self.share()
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.unshare()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_sharing_again_does_not_revive_revoked_links(self):
+        old_url = self.share()
+        self.unshare()
+        new_url = self.share()
+        self.assertNotEqual(new_url, old_url)
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertEqual(self.client.get(new_url).status_code, 200)
+
+    def test_mapping_is_dropped_only_once_unsharing_commits(self):
+        url = self.share()
+        self.client.get(url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                self.file.is_public = False
+                self.file.save(update_fields=["is_public"])
+            # Not yet committed: a concurrent reader still sees the public row
+            # and may re-cache it, so forgetting now would be undone.
+            self.assertIsNotNone(resolve_shared_file(self.file.pk))
+        self.assertEqual(len(callbacks), 2)  # cache generation, share mapping
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url).status_code, 404)
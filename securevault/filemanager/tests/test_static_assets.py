@@ -0,0 +1,76 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from filemanager.views import static_asset
+
+COMPRESSED_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "filemanager.utils.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+
+
+class TemplateAssetTests(TestCase):
+    def test_pages_link_bundles_instead_of_inlining_them(self):
+        self.client.force_login(User.objects.create_user("alice", password="pw"))
+        for name in ("home", "file_list", "notes_list", "upload_file"):
+            html = self.client.get(reverse(name)).content.decode()
+            self.assertNotIn("<style", html)
+            self.assertIn("/static/css/base.css", html)
+            self.assertIn("/static/js/base.js", html)
+
+        html = self.client.get(reverse("upload_file")).content.decode()
+        self.assertIn(f'data-upload-url="{reverse("upload_file")}"', html)
+
+    def test_list_page_html_stays_small(self):
+        # Both empty list pages were over 30 KB with their CSS and JS inlined
+        self.client.force_login(User.objects.create_user("alice", password="pw"))
+        for name in ("file_list", "notes_list"):
+            self.assertLess(len(self.client.get(reverse(name)).content), 10 * 1024, name)
+
+
+class CompressedStaticStorageTests(TestCase):
+    def setUp(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root, ignore_errors=True)
+        overrides = self.settings(STATIC_ROOT=static_root, STORAGES=COMPRESSED_STORAGES)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        self.static_root = static_root
+
+    def test_collectstatic_writes_hashed_and_precompressed_bundles(self):
+        hashed = staticfiles_storage.stored_name("css/base.css")
+        self.assertRegex(hashed, r"^css/base\.[0-9a-f]{12}\.css$")
+
+        path = os.path.join(self.static_root, hashed)
+        with open(path, "rb") as f, gzip.open(path + ".gz") as gz:
+            original = f.read()
+            self.assertEqual(gz.read(), original)
+        self.assertLess(os.path.getsize(path + ".gz"), len(original))
+
+        self.client.force_login(User.objects.create_user("alice", password="pw"))
+        self.assertContains(self.client.get(reverse("file_list")), f"/static/{hashed}")
+
+    def test_serves_precompressed_variant_with_long_cache_lifetime(self):
+        hashed = staticfiles_storage.stored_name("js/upload.js")
+        factory = RequestFactory()
+
+        response = static_asset(factory.get("/", HTTP_ACCEPT_ENCODING="gzip, br;q=0"), hashed)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/javascript")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertIn("immutable", response["Cache-Control"])
+        with staticfiles_storage.open(hashed) as f:
+            self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), f.read())
+
+        response = static_asset(factory.get("/"), "js/upload.js")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertNotIn("immutable", response["Cache-Control"])
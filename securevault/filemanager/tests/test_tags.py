@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from filemanager.models import TAG_MAX_LENGTH, Note, Tag, parse_tags
+
+
+class TagTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("alice", password="pw")
+
+    def counts(self):
+        return dict(Tag.objects.filter(owner=self.user).values_list("name", "note_count"))
+
+    def test_parse_tags_normalizes(self):
+        self.assertEqual(parse_tags(" Work, personal,,work "), ["work", "personal"])
+
+    def test_facet_counts_follow_edits_and_deletes(self):
+        a = Note.objects.create(title="A", content="x", tags="work, home", owner=self.user)
+        Note.objects.create(title="B", content="y", tags="work", owner=self.user)
+        self.assertEqual(self.counts(), {"work": 2, "home": 1})
+
+        a.tags = "home, travel"
+        a.save()
+        self.assertEqual(self.counts(), {"work": 1, "home": 1, "travel": 1})
+
+        a.delete()
+        self.assertEqual(self.counts(), {"work": 1, "home": 0, "travel": 0})
+
+    def test_tag_filter_matches_whole_tags_only(self):
+        Note.objects.create(title="A", content="x", tags="work", owner=self.user)
+        Note.objects.create(title="B", content="y", tags="homework", owner=self.user)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("notes_list"), {"tag": "work"})
+        self.assertEqual([n.title for n in response.context["page_obj"]], ["A"])
+
+    def test_long_tag_links_filter_on_stored_name(self):
+        label = "Quarterly-" + "x" * TAG_MAX_LENGTH
+        Note.objects.create(title="A", content="x", tags=label, owner=self.user)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("notes_list"))
+        stored = label.lower()[:TAG_MAX_LENGTH]
+        self.assertContains(response, f'href="?tag={stored}"', count=3)  # facet, grid, list
+
+        response = self.client.get(reverse("notes_list"), {"tag": stored})
+        self.assertEqual([n.title for n in response.context["page_obj"]], ["A"])
@@ -10,12 +10,19 @@ urlpatterns = [
     path("files/<uuid:file_id>/delete/", fm.delete_file, name="delete_file"),
     path("files/bulk-delete/", fm.bulk_delete_files, name="bulk_delete_files"),
     path("files/<uuid:file_id>/preview/", fm.file_preview, name="file_preview"),
+    path("files/<uuid:file_id>/share/", fm.share_file, name="share_file"),
+    path("files/<uuid:file_id>/unshare/", fm.unshare_file, name="unshare_file"),
+    path("s/<uuid:file_id>/<int:expires>/<str:signature>/", fm.shared_file, name="shared_file"),
 
     path("notes/", fm.notes_list, name="notes_list"),
     path("notes/create/", fm.create_note, name="create_note"),
     path("notes/<uuid:note_id>/edit/", fm.edit_note, name="edit_note"),
     path("notes/<uuid:note_id>/delete/", fm.delete_note, name="delete_note"),
 
+    path("api/files/upload/", fm.api_upload_file, name="api_upload_file"),
+    path("api/upload-admission/", fm.upload_admission_metrics, name="upload_admission_metrics"),
+    path("api/changes/", fm.changes_feed, name="changes_feed"),
+
     path("register/", fm.register, name="register"),
     path("logout/", fm.custom_logout, name="logout"),
 ]
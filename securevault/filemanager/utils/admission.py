@@ -0,0 +1,336 @@
+"""
+Admission control for uploads.
+
+Every upload must pass, in order:
+
+* per-user token buckets for requests/sec and bytes/sec (rejected at once
+  with a Retry-After telling the client when it would fit);
+* a global cap on concurrent uploads, with a bounded wait queue in front of
+  it (rejected when the queue is full or the wait times out).
+
+Views opt in with @admit_upload; UploadAdmissionMiddleware does the check
+before CSRF validation, so a rejected upload body is never read. Under ASGI
+the queue wait is an asyncio sleep rather than a blocked thread.
+
+State lives in a small SQLite database next to the file cache, so every
+worker process on the host enforces the same limits. Counters for tuning
+are kept in the same database.
+"""
+import asyncio
+import math
+import time
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+
+from .sqlitestore import SQLiteStore, get_sqlite_store
+
+DEFAULTS = {
+    "DB_PATH": None,  # defaults to CACHE_DIR / "admission.sqlite3"
+    "USER_REQUESTS_PER_SECOND": 2.0,
+    "USER_REQUEST_BURST": 10,
+    "USER_BYTES_PER_SECOND": 10 * 1024 * 1024,
+    "USER_BYTE_BURST": 100 * 1024 * 1024,
+    "MAX_CONCURRENT_UPLOADS": 8,
+    "QUEUE_SIZE": 16,
+    "QUEUE_TIMEOUT": 10.0,
+    # Slots and queue places older than this belong to crashed workers
+    "SLOT_TTL": 600.0,
+    "POLL_INTERVAL": 0.05,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS slots (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, acquired REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS queue (id INTEGER PRIMARY KEY AUTOINCREMENT, entered REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value REAL NOT NULL);
+"""
+
+
+def get_config() -> dict:
+    config = {**DEFAULTS, **getattr(settings, "UPLOAD_ADMISSION", {})}
+    if config["DB_PATH"] is None:
+        config["DB_PATH"] = settings.CACHE_DIR / "admission.sqlite3"
+    return config
+
+
+class UploadRejected(Exception):
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionStore(SQLiteStore):
+    """SQLite-backed limiter state shared by all processes using the same file."""
+
+    schema = _SCHEMA
+
+    @staticmethod
+    def _incr(conn, name, by=1):
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, by),
+        )
+
+    @staticmethod
+    def _refill(conn, key, rate, capacity, now):
+        row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return float(capacity)
+        tokens, updated = row
+        return min(float(capacity), tokens + max(0.0, now - updated) * rate)
+
+    @staticmethod
+    def _store(conn, key, tokens, now):
+        conn.execute(
+            "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+            (key, tokens, now),
+        )
+
+    def take_tokens(self, user_id, nbytes, config, now=None) -> float:
+        """
+        Charge one request and nbytes to the user's buckets. Returns 0 when
+        admitted, otherwise the seconds until the request would fit.
+
+        Uploads larger than the byte burst are let through once the bucket is
+        full and leave it in debt, which delays the user's next upload.
+        """
+        now = time.time() if now is None else now
+        req_key, byte_key = f"req:{user_id}", f"bytes:{user_id}"
+        req_rate, byte_rate = config["USER_REQUESTS_PER_SECOND"], config["USER_BYTES_PER_SECOND"]
+        byte_burst = config["USER_BYTE_BURST"]
+        with self._transaction() as conn:
+            requests = self._refill(conn, req_key, req_rate, config["USER_REQUEST_BURST"], now)
+            volume = self._refill(conn, byte_key, byte_rate, byte_burst, now)
+            needed = min(nbytes, byte_burst)
+            if requests >= 1 and volume >= needed:
+                self._store(conn, req_key, requests - 1, now)
+                self._store(conn, byte_key, volume - nbytes, now)
+                return 0.0
+            if requests < 1:
+                self._incr(conn, "rejected_request_rate")
+            else:
+                self._incr(conn, "rejected_byte_rate")
+            return max((1 - requests) / req_rate, (needed - volume) / byte_rate, 0.0)
+
+    def try_acquire_slot(self, user_id, config, now=None):
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM slots WHERE acquired < ?", (now - config["SLOT_TTL"],))
+            (in_flight,) = conn.execute("SELECT COUNT(*) FROM slots").fetchone()
+            if in_flight >= config["MAX_CONCURRENT_UPLOADS"]:
+                return None
+            cursor = conn.execute("INSERT INTO slots (user_id, acquired) VALUES (?, ?)", (user_id, now))
+            return cursor.lastrowid
+
+    def release_slot(self, slot_id):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM slots WHERE id = ?", (slot_id,))
+
+    def enter_queue(self, config, now=None):
+        """Take a place in the wait queue; returns its id, or None when full."""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM queue WHERE entered < ?", (now - config["SLOT_TTL"],))
+            (waiting,) = conn.execute("SELECT COUNT(*) FROM queue").fetchone()
+            if waiting >= config["QUEUE_SIZE"]:
+                self._incr(conn, "rejected_queue_full")
+                return None
+            self._incr(conn, "queued")
+            return conn.execute("INSERT INTO queue (entered) VALUES (?)", (now,)).lastrowid
+
+    def leave_queue(self, place_id, waited, timed_out):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM queue WHERE id = ?", (place_id,))
+            self._incr(conn, "queue_wait_seconds", waited)
+            if timed_out:
+                self._incr(conn, "rejected_queue_timeout")
+
+    def record(self, **counts):
+        with self._transaction() as conn:
+            for name, by in counts.items():
+                self._incr(conn, name, by)
+
+    def metrics(self) -> dict:
+        conn = self._conn()
+        stats = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        stats["in_flight"] = conn.execute("SELECT COUNT(*) FROM slots").fetchone()[0]
+        stats["waiting"] = conn.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+        return stats
+
+
+def get_store(config=None) -> AdmissionStore:
+    return get_sqlite_store(AdmissionStore, (config or get_config())["DB_PATH"])
+
+
+def _try_admit(store, user_id, nbytes, config):
+    """
+    Charge the user's buckets and try for a slot without waiting. Returns
+    (slot_id, None) when admitted, or (None, place_id) once queued.
+    """
+    wait = store.take_tokens(user_id, nbytes, config)
+    if wait:
+        raise UploadRejected("Upload rate limit exceeded", wait)
+    slot_id = store.try_acquire_slot(user_id, config)
+    if slot_id is not None:
+        return slot_id, None
+    place_id = store.enter_queue(config)
+    if place_id is None:
+        raise UploadRejected("Too many uploads in progress", config["QUEUE_TIMEOUT"])
+    return None, place_id
+
+
+def _leave_queue(store, place_id, slot_id, started, config):
+    store.leave_queue(place_id, time.monotonic() - started, timed_out=slot_id is None)
+    if slot_id is None:
+        raise UploadRejected("Too many uploads in progress", config["QUEUE_TIMEOUT"])
+
+
+def admit(user_id, nbytes, config=None) -> int:
+    """Admit an upload or raise UploadRejected. Returns the slot to release when done."""
+    config = config or get_config()
+    store = get_store(config)
+
+    slot_id, place_id = _try_admit(store, user_id, nbytes, config)
+    if slot_id is None:
+        started = time.monotonic()
+        deadline = started + config["QUEUE_TIMEOUT"]
+        while slot_id is None and time.monotonic() < deadline:
+            time.sleep(config["POLL_INTERVAL"])
+            slot_id = store.try_acquire_slot(user_id, config)
+        _leave_queue(store, place_id, slot_id, started, config)
+
+    store.record(admitted=1, admitted_bytes=nbytes)
+    return slot_id
+
+
+async def aadmit(user_id, nbytes, config=None) -> int:
+    """
+    Async admit(). The queue wait polls with asyncio.sleep, so a queued
+    upload holds no thread; each store call is a short SQLite transaction
+    run off the event loop.
+    """
+    config = config or get_config()
+    store = get_store(config)
+    run = partial(sync_to_async, thread_sensitive=False)
+
+    slot_id, place_id = await run(_try_admit)(store, user_id, nbytes, config)
+    if slot_id is None:
+        started = time.monotonic()
+        deadline = started + config["QUEUE_TIMEOUT"]
+        while slot_id is None and time.monotonic() < deadline:
+            await asyncio.sleep(config["POLL_INTERVAL"])
+            slot_id = await run(store.try_acquire_slot)(user_id, config)
+        await run(_leave_queue)(store, place_id, slot_id, started, config)
+
+    await run(store.record)(admitted=1, admitted_bytes=nbytes)
+    return slot_id
+
+
+def release(slot_id, config=None):
+    get_store(config).release_slot(slot_id)
+
+
+def admit_upload(view):
+    """
+    Mark a view for UploadAdmissionMiddleware. The check itself must run in
+    the middleware: CsrfViewMiddleware reads request.POST, and with it the
+    whole upload, before any view decorator is reached.
+    """
+    view.admit_upload = True
+    return view
+
+
+class UploadAdmissionMiddleware:
+    """
+    Apply admission control to POSTs to views marked with @admit_upload. Must
+    come before CsrfViewMiddleware so rejected uploads are never read. The
+    upload size is taken from Content-Length; requests without one (chunked
+    bodies) are refused, since their size is unknown until read.
+
+    Under ASGI the check runs as a coroutine: a sync process_view would be
+    run on the thread every sync view shares, and a queued upload would
+    stall them all while it waited.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        try:
+            return self.get_response(request)
+        finally:
+            slot = getattr(request, "_admission_slot", None)
+            if slot is not None:
+                release(*slot)
+
+    async def __acall__(self, request):
+        try:
+            return await self.get_response(request)
+        finally:
+            slot = getattr(request, "_admission_slot", None)
+            if slot is not None:
+                await sync_to_async(release, thread_sensitive=False)(*slot)
+
+    @staticmethod
+    def _upload_size(request, view_func):
+        """Return the body size of an upload to admit, or None to let it pass."""
+        if request.method != "POST" or not getattr(view_func, "admit_upload", False):
+            return None
+        try:
+            return int(request.META.get("CONTENT_LENGTH") or "")
+        except ValueError:
+            return -1
+
+    @staticmethod
+    def _refuse(message, status, retry_after=None):
+        response = JsonResponse({"success": False, "message": message}, status=status)
+        if retry_after is not None:
+            response["Retry-After"] = str(retry_after)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        nbytes = self._upload_size(request, view_func)
+        # The view's login check answers anonymous requests
+        if nbytes is None or not request.user.is_authenticated:
+            return None
+        if nbytes < 0:
+            return self._refuse("Content-Length required", 411)
+        config = get_config()
+        try:
+            slot_id = admit(request.user.pk, nbytes, config)
+        except UploadRejected as e:
+            return self._refuse(e.reason, 429, e.retry_after)
+        request._admission_slot = (slot_id, config)
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        nbytes = self._upload_size(request, view_func)
+        if nbytes is None:
+            return None
+        user = await request.auser()
+        if not user.is_authenticated:
+            return None
+        if nbytes < 0:
+            return self._refuse("Content-Length required", 411)
+        config = get_config()
+        try:
+            slot_id = await aadmit(user.pk, nbytes, config)
+        except UploadRejected as e:
+            return self._refuse(e.reason, 429, e.retry_after)
+        request._admission_slot = (slot_id, config)
+        return None
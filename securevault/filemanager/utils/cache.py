@@ -0,0 +1,100 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import Page, Paginator
+
+from .sqlitestore import SQLiteStore, get_sqlite_store
+
+# Per-user cache entries live in USER_DATA_CACHE (process-local, LRU-culled).
+# Entries hold model rows as stored, so note content and excerpts are always
+# ciphertext; decrypted text must never be cached.
+# The generation counters live in a SQLite file shared by every worker process
+# on the host, so that a bump in one worker invalidates the entries every
+# other worker holds for that user. Bumps are a single atomic UPDATE, so
+# concurrent writers can never merge two bumps into one.
+USER_DATA_CACHE = getattr(settings, "USER_DATA_CACHE", "user_data")
+USER_CACHE_TIMEOUT = getattr(settings, "USER_CACHE_TIMEOUT", 300)
+
+
+def _fresh_generation() -> int:
+    # Seeded from the clock so that a counter lost with the database file
+    # never comes back with a value that was already used.
+    return time.time_ns()
+
+
+class GenerationStore(SQLiteStore):
+    schema = "CREATE TABLE IF NOT EXISTS generations (user_id TEXT PRIMARY KEY, value INTEGER NOT NULL);"
+
+    def get(self, user_id) -> int:
+        conn = self._conn()
+        select = "SELECT value FROM generations WHERE user_id = ?"
+        row = conn.execute(select, (str(user_id),)).fetchone()
+        if row is None:
+            conn.execute(
+                "INSERT OR IGNORE INTO generations (user_id, value) VALUES (?, ?)",
+                (str(user_id), _fresh_generation()),
+            )
+            row = conn.execute(select, (str(user_id),)).fetchone()
+        return row[0]
+
+    def bump(self, user_id) -> None:
+        self._conn().execute(
+            "INSERT INTO generations (user_id, value) VALUES (?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET value = value + 1",
+            (str(user_id), _fresh_generation()),
+        )
+
+
+def _generation_store() -> GenerationStore:
+    path = getattr(settings, "USER_GENERATION_DB", None) or settings.CACHE_DIR / "generations.sqlite3"
+    return get_sqlite_store(GenerationStore, path)
+
+
+def user_generation(user_id) -> int:
+    """Return the current cache generation for a user."""
+    return _generation_store().get(user_id)
+
+
+def bump_user_generation(user_id) -> None:
+    """
+    Invalidate every cached entry of a user by moving to a new generation.
+
+    Call it once the write is committed (see signals.py); bumping earlier lets
+    a concurrent reader cache pre-commit rows under the new generation.
+    """
+    _generation_store().bump(user_id)
+
+
+def user_cache_key(user_id, *parts) -> str:
+    """Build a cache key scoped to a user and their current generation."""
+    digest = hashlib.md5("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f"u:{user_id}:g{user_generation(user_id)}:{digest}"
+
+
+def cached_for_user(user_id, parts, builder):
+    """Return builder() through the per-user cache."""
+    cache = caches[USER_DATA_CACHE]
+    key = user_cache_key(user_id, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, USER_CACHE_TIMEOUT)
+    return value
+
+
+def cached_page(user_id, parts, queryset, per_page, number):
+    """
+    Paginate queryset like Paginator.get_page(), caching the count and the
+    rows of the requested page for the user.
+    """
+    paginator = Paginator(queryset, per_page)
+
+    def build():
+        page = paginator.get_page(number)
+        return paginator.count, page.number, list(page.object_list)
+
+    count, page_number, rows = cached_for_user(user_id, (*parts, number), build)
+    paginator.count = count
+    return Page(rows, page_number, paginator)
@@ -0,0 +1,382 @@
+"""
+In-process load generator.
+
+Drives the project's real WSGI and ASGI applications (no sockets, no external
+tools) with a weighted mix of requests over the filemanager URL names, from
+many concurrent virtual users, and records per-endpoint latency, errors and
+SQLite lock timeouts.
+"""
+import asyncio
+import io
+import itertools
+import math
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.signals import got_request_exception
+from django.db import OperationalError
+from django.test import Client
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import get_resolver, reverse
+from django.utils.crypto import get_random_string
+
+from ..models import Note, UploadedFile
+
+REQUEST_ID_HEADER = "X-Loadtest-Request"
+USERNAME_PREFIX = "loadtest-"
+DEFAULT_MIX = "file_list:3,notes_list:3,home:2,download_file:1,create_note:1,upload_file:1"
+
+
+@dataclass
+class RequestSpec:
+    endpoint: str
+    method: str
+    path: str
+    query: str = ""
+    body: bytes = b""
+    content_type: str = ""
+    headers: dict = field(default_factory=dict)
+
+
+@dataclass
+class VirtualUser:
+    username: str
+    cookie: str
+    csrf_token: str
+    file_ids: list
+    note_ids: list
+
+
+def parse_mix(text):
+    """Parse "name:weight,name:weight" into (names, weights)."""
+    names, weights = [], []
+    for item in text.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unsupported endpoint {name!r}; choose from {', '.join(sorted(ENDPOINTS))}")
+        if name not in get_resolver().reverse_dict:
+            raise ValueError(f"Endpoint {name!r} is not routed in this project")
+        names.append(name)
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+# ---------- Request builders ----------
+
+def _get(endpoint, path, query=None):
+    return RequestSpec(endpoint, "GET", path, urlencode(query or {}))
+
+
+def _post_form(endpoint, path, user, data):
+    return RequestSpec(
+        endpoint, "POST", path, body=urlencode(data).encode(),
+        content_type="application/x-www-form-urlencoded",
+        headers={"X-CSRFToken": user.csrf_token},
+    )
+
+
+def _post_upload(endpoint, path, user, size, rng):
+    upload = SimpleUploadedFile(f"load-{rng.randrange(10**9)}.bin", rng.randbytes(size))
+    return RequestSpec(
+        endpoint, "POST", path, body=encode_multipart(BOUNDARY, {"file": upload, "description": "load test"}),
+        content_type=MULTIPART_CONTENT, headers={"X-CSRFToken": user.csrf_token},
+    )
+
+
+def _list_query(rng):
+    # One in five list requests is a search, the rest page through
+    if rng.random() < 0.2:
+        return {"search": rng.choice(["report", "note", "load", "2024"])}
+    return {"page": rng.randint(1, 3)}
+
+
+ENDPOINTS = {
+    "home": lambda u, rng, size: _get("home", reverse("home")),
+    "file_list": lambda u, rng, size: _get("file_list", reverse("file_list"), _list_query(rng)),
+    "notes_list": lambda u, rng, size: _get("notes_list", reverse("notes_list"), _list_query(rng)),
+    "download_file": lambda u, rng, size: _get(
+        "download_file", reverse("download_file", args=[rng.choice(u.file_ids)])),
+    "file_preview": lambda u, rng, size: _get(
+        "file_preview", reverse("file_preview", args=[rng.choice(u.file_ids)])),
+    "api_upload_file": lambda u, rng, size: _post_upload(
+        "api_upload_file", reverse("api_upload_file"), u, size, rng),
+    "upload_file": lambda u, rng, size: _post_upload("upload_file", reverse("upload_file"), u, size, rng),
+    "create_note": lambda u, rng, size: _post_form("create_note", reverse("create_note"), u, {
+        "title": f"Load note {rng.randrange(10**6)}", "content": "x" * rng.randint(100, 5000),
+        "tags": "load, test"}),
+    "edit_note": lambda u, rng, size: _post_form(
+        "edit_note", reverse("edit_note", args=[rng.choice(u.note_ids)]), u, {
+            "title": "Edited load note", "content": "y" * rng.randint(100, 5000), "tags": "load"}),
+}
+
+
+# ---------- Fixtures ----------
+
+def seed_users(count, files, notes):
+    """Create virtual users with sessions, CSRF tokens, files and notes."""
+    users = []
+    for i in range(count):
+        user = User.objects.create_user(f"{USERNAME_PREFIX}{i}-{get_random_string(6)}")
+        client = Client()
+        client.force_login(user)
+        file_ids = [
+            str(UploadedFile.objects.create(
+                name=f"report-{n}.txt", description="seeded by loadtest", owner=user,
+                file=ContentFile(b"x" * 1024, name=f"report-{n}.txt"),
+            ).pk)
+            for n in range(files)
+        ]
+        note_ids = [
+            str(Note.objects.create(title=f"Note {n}", content="seeded " * 50, tags="load", owner=user).pk)
+            for n in range(notes)
+        ]
+        csrf = get_random_string(32)
+        cookie = f"sessionid={client.cookies['sessionid'].value}; csrftoken={csrf}"
+        users.append(VirtualUser(user.username, cookie, csrf, file_ids, note_ids))
+    return users
+
+
+def delete_seeded_users(users):
+    """
+    Remove the users created by seed_users(), together with their stored
+    files. Other accounts are left alone, even if their names share the
+    load-test prefix.
+    """
+    usernames = [u.username for u in users]
+    for f in UploadedFile.objects.filter(owner__username__in=usernames).iterator():
+        f.file.delete(save=False)
+    User.objects.filter(username__in=usernames).delete()
+
+
+# ---------- Statistics ----------
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.locked = defaultdict(int)
+        self.lock_failures = set()
+        self.started = self.finished = None
+
+    def on_exception(self, sender, request=None, **kwargs):
+        """got_request_exception receiver flagging SQLite lock timeouts."""
+        exc = sys.exc_info()[1]
+        if request is not None and isinstance(exc, OperationalError) and "locked" in str(exc):
+            with self._lock:
+                self.lock_failures.add(request.headers.get(REQUEST_ID_HEADER))
+
+    def record(self, request_id, endpoint, status, elapsed):
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            if status >= 400:
+                self.errors[endpoint] += 1
+            if request_id in self.lock_failures:
+                self.lock_failures.discard(request_id)
+                self.locked[endpoint] += 1
+
+    def summary(self):
+        duration = max(self.finished - self.started, 1e-9)
+        rows = []
+        all_latencies = []
+        for endpoint in sorted(self.latencies):
+            samples = self.latencies[endpoint]
+            all_latencies.extend(samples)
+            rows.append(self._row(endpoint, samples, self.errors[endpoint], self.locked[endpoint], duration))
+        rows.append(self._row(
+            "TOTAL", all_latencies, sum(self.errors.values()), sum(self.locked.values()), duration))
+        return {"duration": duration, "endpoints": rows}
+
+    @staticmethod
+    def _row(endpoint, samples, errors, locked, duration):
+        count = len(samples)
+        ordered = sorted(samples)
+        return {
+            "endpoint": endpoint,
+            "requests": count,
+            "throughput": count / duration,
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+            "error_rate": errors / count if count else 0.0,
+            "lock_timeout_rate": locked / count if count else 0.0,
+        }
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def format_summary(summary, interface):
+    lines = [
+        f"{interface.upper()}  {summary['duration']:.1f}s",
+        f"{'endpoint':<18}{'reqs':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>9}{'locked':>9}",
+    ]
+    for row in summary["endpoints"]:
+        lines.append(
+            f"{row['endpoint']:<18}{row['requests']:>8}{row['throughput']:>9.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row['error_rate']:>9.1%}{row['lock_timeout_rate']:>9.1%}"
+        )
+    return "\n".join(lines)
+
+
+# ---------- Drivers ----------
+
+class LoadRun:
+    """One load run: picks requests from the mix until time or budget runs out."""
+
+    def __init__(self, users, mix, concurrency, duration, max_requests=None, upload_size=65536, seed=None):
+        self.users = users
+        self.names, self.weights = parse_mix(mix)
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+        self.upload_size = upload_size
+        self.seed = seed
+        self.stats = Stats()
+        self._ids = itertools.count()
+        self._deadline = None
+
+    def _next(self, rng):
+        """Return (request_id, user, spec), or None once the run is over."""
+        request_id = next(self._ids)
+        if time.perf_counter() >= self._deadline:
+            return None
+        if self.max_requests is not None and request_id >= self.max_requests:
+            return None
+        user = rng.choice(self.users)
+        endpoint = rng.choices(self.names, self.weights)[0]
+        return str(request_id), user, ENDPOINTS[endpoint](user, rng, self.upload_size)
+
+    def _headers(self, request_id, user, spec):
+        headers = {"Host": "localhost", "Cookie": user.cookie, REQUEST_ID_HEADER: request_id}
+        headers.update(spec.headers)
+        if spec.content_type:
+            headers["Content-Type"] = spec.content_type
+            headers["Content-Length"] = str(len(spec.body))
+        return headers
+
+    def _start(self):
+        got_request_exception.connect(self.stats.on_exception)
+        self._deadline = time.perf_counter() + self.duration
+        self.stats.started = time.perf_counter()
+
+    def _stop(self):
+        self.stats.finished = time.perf_counter()
+        got_request_exception.disconnect(self.stats.on_exception)
+        return self.stats.summary()
+
+    # WSGI
+
+    def run_wsgi(self, application):
+        self._start()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for worker in [pool.submit(self._wsgi_worker, application, n) for n in range(self.concurrency)]:
+                worker.result()
+        return self._stop()
+
+    def _wsgi_worker(self, application, n):
+        rng = random.Random(None if self.seed is None else self.seed + n)
+        while (item := self._next(rng)) is not None:
+            request_id, user, spec = item
+            environ = {
+                "REQUEST_METHOD": spec.method,
+                "PATH_INFO": spec.path,
+                "QUERY_STRING": spec.query,
+                "SCRIPT_NAME": "",
+                "SERVER_NAME": "localhost",
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "REMOTE_ADDR": "127.0.0.1",
+                "wsgi.version": (1, 0),
+                "wsgi.url_scheme": "http",
+                "wsgi.input": io.BytesIO(spec.body),
+                "wsgi.errors": io.StringIO(),
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": False,
+                "wsgi.run_once": False,
+            }
+            for name, value in self._headers(request_id, user, spec).items():
+                key = name.upper().replace("-", "_")
+                if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                    key = f"HTTP_{key}"
+                environ[key] = value
+
+            status = []
+            started = time.perf_counter()
+            result = application(environ, lambda s, headers, exc_info=None: status.append(s))
+            try:
+                for _ in result:
+                    pass
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+            self.stats.record(request_id, spec.endpoint, int(status[0].split()[0]), time.perf_counter() - started)
+
+    # ASGI
+
+    def run_asgi(self, application):
+        self._start()
+        asyncio.run(self._asgi_main(application))
+        return self._stop()
+
+    async def _asgi_main(self, application):
+        await asyncio.gather(*(self._asgi_worker(application, n) for n in range(self.concurrency)))
+
+    async def _asgi_worker(self, application, n):
+        rng = random.Random(None if self.seed is None else self.seed + n)
+        while (item := self._next(rng)) is not None:
+            request_id, user, spec = item
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": spec.method,
+                "scheme": "http",
+                "path": spec.path,
+                "raw_path": spec.path.encode(),
+                "query_string": spec.query.encode(),
+                "root_path": "",
+                "headers": [
+                    (name.lower().encode(), value.encode())
+                    for name, value in self._headers(request_id, user, spec).items()
+                ],
+                "client": ("127.0.0.1", 0),
+                "server": ("localhost", 80),
+            }
+            done = asyncio.Event()
+            body_sent = False
+            status = []
+
+            async def receive():
+                nonlocal body_sent
+                if not body_sent:
+                    body_sent = True
+                    return {"type": "http.request", "body": spec.body, "more_body": False}
+                # Django listens for a disconnect while the view runs
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+                elif message["type"] == "http.response.body" and not message.get("more_body"):
+                    done.set()
+
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            done.set()
+            self.stats.record(request_id, spec.endpoint, status[0] if status else 500, time.perf_counter() - started)
@@ -0,0 +1,222 @@
+import re
+import uuid
+from collections import namedtuple
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from ..models import UploadedFile
+
+FILE_INDEX = "filemanager_uploadedfile_fts"
+
+# Control characters used as snippet markers so that the text around them can
+# be HTML-escaped before they are turned into <mark> tags.
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+
+FileHit = namedtuple("FileHit", ["file_id", "name", "description"])
+
+_CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FILE_INDEX} USING fts5(
+        file_id UNINDEXED, owner_id UNINDEXED, name, description,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FILE_INDEX}_ai AFTER INSERT ON filemanager_uploadedfile BEGIN
+        INSERT INTO {FILE_INDEX} (file_id, owner_id, name, description)
+        VALUES (new.id, new.owner_id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FILE_INDEX}_ad AFTER DELETE ON filemanager_uploadedfile BEGIN
+        DELETE FROM {FILE_INDEX} WHERE file_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FILE_INDEX}_au
+    AFTER UPDATE OF name, description, owner_id ON filemanager_uploadedfile BEGIN
+        DELETE FROM {FILE_INDEX} WHERE file_id = old.id;
+        INSERT INTO {FILE_INDEX} (file_id, owner_id, name, description)
+        VALUES (new.id, new.owner_id, new.name, new.description);
+    END
+    """,
+]
+
+_DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FILE_INDEX}_ai",
+    f"DROP TRIGGER IF EXISTS {FILE_INDEX}_ad",
+    f"DROP TRIGGER IF EXISTS {FILE_INDEX}_au",
+    f"DROP TABLE IF EXISTS {FILE_INDEX}",
+]
+
+
+def fts5_supported(conn=connection) -> bool:
+    """True when the database is SQLite and was built with FTS5."""
+    if conn.vendor != "sqlite":
+        return False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp.fts5_probe")
+    except DatabaseError:
+        return False
+    return True
+
+
+def create_file_index(conn=connection) -> bool:
+    """Create the FTS5 table and its sync triggers. Returns False if unsupported."""
+    if not fts5_supported(conn):
+        return False
+    with conn.cursor() as cursor:
+        for sql in _CREATE_SQL:
+            cursor.execute(sql)
+    return True
+
+
+def drop_file_index(conn=connection) -> None:
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cursor:
+        for sql in _DROP_SQL:
+            cursor.execute(sql)
+
+
+def rebuild_file_index(conn=connection) -> int:
+    """Recreate the index from filemanager_uploadedfile. Returns rows indexed."""
+    drop_file_index(conn)
+    if not create_file_index(conn):
+        return 0
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FILE_INDEX} (file_id, owner_id, name, description) "
+            f"SELECT id, owner_id, name, description FROM filemanager_uploadedfile"
+        )
+        return cursor.rowcount
+
+
+def ensure_file_index(conn=connection) -> None:
+    """
+    Reinstall the index after migrations. SQLite drops the sync triggers
+    whenever Django rebuilds filemanager_uploadedfile to alter a column, and
+    writes made while they were missing never reached the index, so it is
+    rebuilt from the table in that case.
+    """
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        present = {row[0] for row in cursor.fetchall()}
+    if "filemanager_uploadedfile" not in present:
+        return
+    if {FILE_INDEX, f"{FILE_INDEX}_ai", f"{FILE_INDEX}_ad", f"{FILE_INDEX}_au"} <= present:
+        return
+    rebuild_file_index(conn)
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word is a quoted prefix term."""
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _highlight(fragment: str) -> str:
+    return mark_safe(
+        escape(fragment).replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+    )
+
+
+def _match_clause(owner_id, text):
+    return f"{FILE_INDEX} MATCH %s AND owner_id = %s", [build_match_query(text), owner_id]
+
+
+def count_matching_files(owner_id, text):
+    """Number of owner's files matching text, or None when the FTS index is unavailable."""
+    if not build_match_query(text):
+        return 0
+    where, params = _match_clause(owner_id, text)
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {FILE_INDEX} WHERE {where}", params)
+            return cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+
+
+def matching_file_ids(owner_id, text) -> RawSQL:
+    """Subquery selecting the ids of owner's matching files, for pk__in filters."""
+    where, params = _match_clause(owner_id, text)
+    return RawSQL(f"SELECT file_id FROM {FILE_INDEX} WHERE {where}", params)
+
+
+def search_files(owner_id, text, limit=-1, offset=0, file_ids=None):
+    """
+    Return FileHit tuples for owner's files matching text, best match first,
+    with highlighted name and description snippets. limit/offset select one
+    page of the ranking (-1 is no limit); file_ids restricts the hits to
+    those files.
+
+    Returns None when the FTS index is unavailable so callers can fall back
+    to a LIKE query.
+    """
+    if not build_match_query(text) or file_ids == []:
+        return []
+    where, params = _match_clause(owner_id, text)
+    if file_ids is not None:
+        where += f" AND file_id IN ({', '.join(['%s'] * len(file_ids))})"
+        params += list(file_ids)
+    sql = (
+        f"SELECT file_id,"
+        f" highlight({FILE_INDEX}, 2, %s, %s),"
+        f" snippet({FILE_INDEX}, 3, %s, %s, '…', 16)"
+        f" FROM {FILE_INDEX}"
+        f" WHERE {where}"
+        f" ORDER BY bm25({FILE_INDEX}, 0, 0, 10.0, 1.0)"
+        f" LIMIT %s OFFSET %s"
+    )
+    params = [_MARK_OPEN, _MARK_CLOSE, _MARK_OPEN, _MARK_CLOSE, *params, limit, offset]
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError:
+        return None
+    return [FileHit(file_id, _highlight(name), _highlight(desc)) for file_id, name, desc in rows]
+
+
+class RankedFileResults:
+    """
+    An owner's matching files in rank order, sliceable for Paginator. Every
+    page is its own FTS query with LIMIT/OFFSET, so no match is ever cut off;
+    each file carries its FileHit as `search_hit`.
+    """
+
+    def __init__(self, owner_id, text, count):
+        self.owner_id = owner_id
+        self.text = text
+        self._count = count
+
+    def count(self):
+        return self._count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        stop = self._count if index.stop is None else index.stop
+        hits = search_files(self.owner_id, self.text, limit=max(0, stop - start), offset=start) or []
+        files = UploadedFile.objects.filter(owner_id=self.owner_id).in_bulk(
+            [uuid.UUID(hit.file_id) for hit in hits]
+        )
+        results = []
+        for hit in hits:
+            f = files.get(uuid.UUID(hit.file_id))
+            if f is not None:
+                f.search_hit = hit
+                results.append(f)
+        return results
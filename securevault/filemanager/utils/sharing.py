@@ -0,0 +1,72 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from ..models import UploadedFile
+
+# Share links are <file id>/<expiry>/<HMAC>. They are verified without any
+# database or session access: the file's storage path and share version come
+# from a small cache entry that is dropped whenever the file changes. The
+# share version is signed too, so unsharing (which bumps it) kills every
+# link issued before, even if the file is shared again later.
+SHARE_LINK_MAX_AGE = getattr(settings, "SHARE_LINK_MAX_AGE", 7 * 24 * 3600)
+SHARE_CACHE = getattr(settings, "SHARE_CACHE", "shared")
+SHARE_MAPPING_TIMEOUT = 3600
+_SALT = "filemanager.share"
+
+
+def sign_share(file_id, share_version: int, expires: int) -> str:
+    value = f"{file_id.hex}:{share_version}:{expires}"
+    return salted_hmac(_SALT, value, algorithm="sha256").hexdigest()
+
+
+def make_share_path(file_id, share_version, max_age=SHARE_LINK_MAX_AGE, now=None):
+    """
+    Return (path, expires) for a share link valid for at least max_age seconds.
+
+    The expiry is rounded up to the hour so links issued close together are
+    identical and share one entry in a reverse proxy cache.
+    """
+    now = time.time() if now is None else now
+    expires = math.ceil((now + max_age) / 3600) * 3600
+    signature = sign_share(file_id, share_version, expires)
+    path = reverse("shared_file", args=[file_id, expires, signature])
+    return path, expires
+
+
+def verify_share(file_id, share_version, expires: int, signature: str, now=None) -> bool:
+    now = time.time() if now is None else now
+    return expires > now and constant_time_compare(signature, sign_share(file_id, share_version, expires))
+
+
+def _mapping_key(file_id) -> str:
+    return f"share:{file_id.hex}"
+
+
+def resolve_shared_file(file_id):
+    """
+    Return {"path", "name", "mime_type", "share_version"} for a public file,
+    or None.
+
+    Misses (including non-public files) are cached too, so a hot link costs
+    no query until the file is saved or deleted.
+    """
+    cache = caches[SHARE_CACHE]
+    entry = cache.get(_mapping_key(file_id))
+    if entry is None:
+        row = (UploadedFile.objects.filter(pk=file_id, is_public=True)
+               .values("file", "name", "mime_type", "share_version").first())
+        entry = {
+            "path": row["file"], "name": row["name"], "mime_type": row["mime_type"],
+            "share_version": row["share_version"],
+        } if row else False
+        cache.set(_mapping_key(file_id), entry, SHARE_MAPPING_TIMEOUT)
+    return entry or None
+
+
+def forget_shared_file(file_id) -> None:
+    caches[SHARE_CACHE].delete(_mapping_key(file_id))
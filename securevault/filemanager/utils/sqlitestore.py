@@ -0,0 +1,53 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteStore:
+    """
+    Small SQLite database shared by every worker process on the host.
+
+    Subclasses set `schema`; connections are opened lazily, one per thread,
+    in WAL mode so readers never wait for a writer.
+    """
+
+    schema = ""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.schema)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_sqlite_store(cls, path):
+    """Return the process-wide instance of cls for the database at path."""
+    key = (cls, str(path))
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = cls(path)
+        return _stores[key]
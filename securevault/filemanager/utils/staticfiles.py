@@ -0,0 +1,60 @@
+"""
+Static file storage that writes content-hashed names (via the manifest) and
+precompressed .gz / .br siblings at collectstatic time, so production serves
+each bundle with a far-future Cache-Control and no per-request compression.
+"""
+import gzip
+import os
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip variants are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".map", ".xml", ".html"}
+MIN_COMPRESS_SIZE = 256
+
+# ManifestStaticFilesStorage inserts the first 12 hex digits of the MD5
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+
+def is_hashed_name(path: str) -> bool:
+    return bool(_HASHED_NAME.search(path))
+
+
+def compress_variants(data: bytes):
+    """Yield (suffix, compressed bytes) for every encoding that saves space."""
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            yield suffix, compressed
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name:
+                names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name in sorted(names):
+                self.compress(name)
+
+    def compress(self, name):
+        if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in compress_variants(data):
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
@@ -1,20 +1,28 @@
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout, get_user_model
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
-from django.core.paginator import Paginator
-from django.db.models import Q
-from django.http import JsonResponse, Http404, FileResponse, HttpResponse
+from django.db.models import F, Max, Q
+from django.http import JsonResponse, Http404, FileResponse, HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils._os import safe_join
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import condition, require_GET, require_POST
+from django.views.static import serve as static_serve
 
 import mimetypes
 import os
+import time
 
 from .forms import FileUploadForm, NoteForm  # keep using your existing forms
-from .models import UploadedFile, Note
+from .models import TAG_MAX_LENGTH, ChangeLogEntry, ChangeLogHorizon, UploadedFile, Note, NoteTag, Tag
+from .utils.admission import admit_upload, get_config as admission_config, get_store as admission_store
+from .utils.cache import cached_for_user, cached_page
+from .utils.search import RankedFileResults, count_matching_files, matching_file_ids, search_files
+from .utils.sharing import make_share_path, resolve_shared_file, verify_share
+from .utils.staticfiles import is_hashed_name
 
 
 # ---------- Registration / Auth ----------
@@ -72,9 +80,17 @@ def custom_logout(request):
 
 def home(request):
     if request.user.is_authenticated:
-        recent_files = UploadedFile.objects.filter(owner=request.user).order_by("-uploaded_at")[:5]
-        recent_notes = Note.objects.filter(owner=request.user).order_by("-updated_at")[:5]
-        total_files = UploadedFile.objects.filter(owner=request.user).count()
+        def load_dashboard():
+            return (
+                list(UploadedFile.objects.filter(owner=request.user).order_by("-uploaded_at")[:5]),
+                list(Note.objects.filter(owner=request.user).defer("content", "excerpt")
+                     .order_by("-updated_at")[:5]),
+                UploadedFile.objects.filter(owner=request.user).count(),
+            )
+
+        recent_files, recent_notes, total_files = cached_for_user(
+            request.user.pk, ("dashboard",), load_dashboard
+        )
         total_size = sum(f.size for f in recent_files)
 
         def format_file_size(size):
@@ -101,25 +117,39 @@ def home(request):
 @login_required
 def file_list(request):
     search_query = request.GET.get("search", "")
-    sort_by = request.GET.get("sort", "date")
+    sort_by = request.GET.get("sort", "relevance" if search_query else "date")
 
     files = UploadedFile.objects.filter(owner=request.user)
+    matches = None
 
     if search_query:
-        files = files.filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query)
+        matches = cached_for_user(
+            request.user.pk, ("file_search_count", search_query),
+            lambda: count_matching_files(request.user.pk, search_query),
         )
-
-    if sort_by == "name":
-        files = files.order_by("name")
-    elif sort_by == "size":
-        files = files.order_by("-size")
-    else:
-        files = files.order_by("-uploaded_at")
-
-    paginator = Paginator(files, 12)
-    page_obj = paginator.get_page(request.GET.get("page"))
+        if matches is None:
+            # No FTS5 index on this database
+            files = files.filter(
+                Q(name__icontains=search_query) |
+                Q(description__icontains=search_query)
+            )
+        elif sort_by == "relevance":
+            # Ranked and paged inside the FTS query itself
+            files = RankedFileResults(request.user.pk, search_query, matches)
+        else:
+            files = files.filter(pk__in=matching_file_ids(request.user.pk, search_query))
+
+    if not isinstance(files, RankedFileResults):
+        files = files.order_by({"name": "name", "size": "-size"}.get(sort_by, "-uploaded_at"))
+
+    page_obj = cached_page(
+        request.user.pk, ("files", search_query, sort_by), files, 12, request.GET.get("page")
+    )
+    if matches is not None and not isinstance(files, RankedFileResults):
+        hits = search_files(request.user.pk, search_query, file_ids=[f.pk.hex for f in page_obj]) or []
+        by_id = {hit.file_id: hit for hit in hits}
+        for f in page_obj:
+            f.search_hit = by_id.get(f.pk.hex)
 
     return render(request, "filemanager/file_list.html", {
         "page_obj": page_obj,
@@ -129,6 +159,7 @@ def file_list(request):
 
 
 @login_required
+@admit_upload
 def upload_file(request):
     if request.method == "POST":
         form = FileUploadForm(request.POST, request.FILES)
@@ -171,8 +202,10 @@ def upload_file(request):
 @login_required
 def download_file(request, file_id):
     file_obj = get_object_or_404(UploadedFile, id=file_id, owner=request.user)
-    file_obj.download_count += 1
-    file_obj.save(update_fields=["download_count"])
+    # A counter bump is not a change to the file: update() skips the save
+    # signals, so sync clients are not told to re-fetch it and the owner's
+    # cached pages survive.
+    UploadedFile.objects.filter(pk=file_obj.pk).update(download_count=F("download_count") + 1)
 
     if not file_obj.file:
         raise Http404("File not found")
@@ -220,6 +253,7 @@ def delete_file(request, file_id):
 
 @login_required
 @csrf_exempt
+@admit_upload
 def api_upload_file(request):
     if request.method == "POST" and request.FILES.get("file"):
         try:
@@ -256,6 +290,16 @@ def api_upload_file(request):
     return JsonResponse({"success": False, "message": "Invalid request"})
 
 
+@staff_member_required
+def upload_admission_metrics(request):
+    """Limiter counters and settings, for tuning UPLOAD_ADMISSION."""
+    config = admission_config()
+    return JsonResponse({
+        "metrics": admission_store(config).metrics(),
+        "config": {k: v for k, v in config.items() if k != "DB_PATH"},
+    })
+
+
 @login_required
 def bulk_delete_files(request):
     if request.method != "POST":
@@ -288,26 +332,106 @@ def file_preview(request, file_id):
     return JsonResponse({"success": False, "message": "Preview not available for this file type"})
 
 
+# ---------- Sharing ----------
+
+# Upper bound on how long a reverse proxy may keep serving a shared file,
+# i.e. how long unsharing can take to reach cached copies
+SHARED_FILE_PROXY_MAX_AGE = 3600
+
+
+@login_required
+@require_POST
+def share_file(request, file_id):
+    f = get_object_or_404(UploadedFile, id=file_id, owner=request.user)
+    if not f.is_public:
+        # New version: links from an earlier sharing period stay dead
+        f.is_public = True
+        f.share_version += 1
+        f.save(update_fields=["is_public", "share_version"])
+    path, expires = make_share_path(f.pk, f.share_version)
+    return JsonResponse({
+        "success": True,
+        "url": request.build_absolute_uri(path),
+        "expires": expires,
+    })
+
+
+@login_required
+@require_POST
+def unshare_file(request, file_id):
+    """Revoke every share link of a file at once."""
+    f = get_object_or_404(UploadedFile, id=file_id, owner=request.user)
+    f.is_public = False
+    f.share_version += 1
+    f.save(update_fields=["is_public", "share_version"])
+    return JsonResponse({"success": True})
+
+
+def shared_file(request, file_id, expires, signature):
+    """
+    Serve a public file from a signed link. Needs no login, session or
+    per-request query: the storage path and share version come from the
+    cached share mapping, and the signature and expiry are checked against
+    them.
+    """
+    entry = resolve_shared_file(file_id)
+    if entry is None or not verify_share(file_id, entry["share_version"], expires, signature):
+        raise Http404("Link is invalid or has expired")
+
+    # Stored bytes never change for a given file id
+    etag = f'"{file_id.hex}"'
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponseNotModified()
+    else:
+        try:
+            handle = UploadedFile._meta.get_field("file").storage.open(entry["path"], "rb")
+        except FileNotFoundError:
+            raise Http404("File not found")
+        response = FileResponse(
+            handle, as_attachment=True, filename=entry["name"],
+            content_type=entry["mime_type"] or None,
+        )
+    max_age = max(0, min(expires - int(time.time()), SHARED_FILE_PROXY_MAX_AGE))
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
 # ---------- Notes ----------
 
 @login_required
 def notes_list(request):
     search_query = request.GET.get("search", "")
-    notes = Note.objects.filter(owner=request.user).order_by("-updated_at")
+    active_tag = request.GET.get("tag", "").strip().lower()[:TAG_MAX_LENGTH]
+    notes = Note.objects.filter(owner=request.user).defer("content").order_by("-updated_at")
+
+    if active_tag:
+        notes = notes.filter(tag_links__owner=request.user, tag_links__tag__name=active_tag)
 
     if search_query:
+        tagged = NoteTag.objects.filter(
+            owner=request.user, tag__name=search_query.strip().lower()
+        ).values("note_id")
         notes = notes.filter(
             Q(title__icontains=search_query) |
             Q(content__icontains=search_query) |
-            Q(tags__icontains=search_query)
+            Q(pk__in=tagged)
         )
 
-    paginator = Paginator(notes, 12)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    page_obj = cached_page(
+        request.user.pk, ("notes", search_query, active_tag), notes, 12, request.GET.get("page")
+    )
+    tag_facets = cached_for_user(
+        request.user.pk, ("tag_facets",),
+        lambda: list(Tag.objects.filter(owner=request.user, note_count__gt=0)
+                     .order_by("-note_count", "name")[:30]),
+    )
 
     return render(request, "filemanager/notes_list.html", {
         "page_obj": page_obj,
         "search_query": search_query,
+        "active_tag": active_tag,
+        "tag_facets": tag_facets,
     })
 
 
@@ -361,3 +485,162 @@ def delete_note(request, note_id):
 
     messages.info(request, "Please confirm deletion.")
     return redirect("notes_list")
+
+
+# ---------- Sync ----------
+
+CHANGES_DEFAULT_LIMIT = 100
+CHANGES_MAX_LIMIT = 500
+
+
+def _changes_params(request):
+    """Return (since, limit) from the query string; raises ValueError if malformed."""
+    since = int(request.GET.get("since", 0))
+    limit = int(request.GET.get("limit", CHANGES_DEFAULT_LIMIT))
+    if since < 0 or limit < 1:
+        raise ValueError("since and limit must be positive")
+    return since, min(limit, CHANGES_MAX_LIMIT)
+
+
+def _pruned_through(user):
+    return (ChangeLogHorizon.objects.filter(owner=user)
+            .values_list("pruned_through", flat=True).first() or 0)
+
+
+def _changes_etag(request):
+    if not request.user.is_authenticated:
+        return None
+    try:
+        since, limit = _changes_params(request)
+    except ValueError:
+        return None
+    latest = ChangeLogEntry.objects.filter(owner=request.user).aggregate(latest=Max("id"))["latest"] or 0
+    return f"{request.user.pk}-{since}-{limit}-{latest}-{_pruned_through(request.user)}"
+
+
+def _serialize_file(f):
+    return {
+        "name": f.name,
+        "description": f.description,
+        "size": f.size,
+        "mime_type": f.mime_type,
+        "file_type": f.file_type,
+        "uploaded_at": f.uploaded_at.isoformat(),
+        "download_count": f.download_count,
+    }
+
+
+def _serialize_note(n):
+    return {
+        "title": n.title,
+        "content": n.decrypted_content,
+        "tags": n.tag_list,
+        "created_at": n.created_at.isoformat(),
+        "updated_at": n.updated_at.isoformat(),
+    }
+
+
+@login_required
+@require_GET
+@condition(etag_func=_changes_etag)
+def changes_feed(request):
+    """
+    Changes to the user's files and notes after the ?since= cursor, oldest
+    first, at most ?limit= log entries per call. Several changes to the same
+    object within one batch collapse into its latest state.
+    """
+    try:
+        since, limit = _changes_params(request)
+    except ValueError:
+        return JsonResponse({"success": False, "message": "Invalid since or limit"}, status=400)
+
+    if since and since < _pruned_through(request.user):
+        # Tombstones after this cursor were pruned; deletions could be missed
+        return JsonResponse(
+            {"success": False, "message": "Cursor expired, resync from since=0", "resync": True},
+            status=410,
+        )
+
+    entries = list(
+        ChangeLogEntry.objects.filter(owner=request.user, id__gt=since).order_by("id")[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    cursor = entries[-1].id if entries else since
+
+    latest = {}
+    for entry in entries:
+        latest[(entry.object_type, entry.object_id)] = entry
+
+    def upserted(object_type):
+        return [e.object_id for e in latest.values()
+                if e.object_type == object_type and e.action == ChangeLogEntry.UPSERT]
+
+    files = UploadedFile.objects.filter(owner=request.user).in_bulk(upserted(ChangeLogEntry.FILE))
+    notes = Note.objects.filter(owner=request.user).in_bulk(upserted(ChangeLogEntry.NOTE))
+
+    changes = []
+    for entry in sorted(latest.values(), key=lambda e: e.id):
+        change = {
+            "cursor": entry.id,
+            "type": entry.object_type,
+            "id": str(entry.object_id),
+            "action": entry.action,
+            "changed_at": entry.changed_at.isoformat(),
+        }
+        if entry.action == ChangeLogEntry.UPSERT:
+            if entry.object_type == ChangeLogEntry.FILE:
+                obj, serialize = files.get(entry.object_id), _serialize_file
+            else:
+                obj, serialize = notes.get(entry.object_id), _serialize_note
+            if obj is None:
+                # Deleted since; its tombstone comes in a later entry
+                continue
+            change["data"] = serialize(obj)
+        changes.append(change)
+
+    return JsonResponse({"changes": changes, "cursor": cursor, "has_more": has_more})
+
+
+# ---------- Static assets ----------
+
+# Hashed bundle names change whenever their content does
+STATIC_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+@require_GET
+def static_asset(request, path):
+    """
+    Serve a file from STATIC_ROOT when no front-end server does, picking the
+    precompressed .br or .gz variant written by collectstatic when the client
+    accepts it. Content-hashed names are cached for a year.
+    """
+    accepted = _accepted_encodings(request)
+    served = path
+    for suffix, coding in ((".br", "br"), (".gz", "gzip")):
+        if coding in accepted and os.path.isfile(safe_join(settings.STATIC_ROOT, path + suffix)):
+            served = path + suffix
+            break
+    response = static_serve(request, served, document_root=settings.STATIC_ROOT)
+    response["Vary"] = "Accept-Encoding"
+    response["Cache-Control"] = (
+        STATIC_IMMUTABLE_CACHE_CONTROL if is_hashed_name(path) else STATIC_REVALIDATE_CACHE_CONTROL
+    )
+    return response
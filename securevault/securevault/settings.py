@@ -30,6 +30,8 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    # Before CSRF, which reads the request body
+    'filemanager.utils.admission.UploadAdmissionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -77,12 +79,72 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Outside DEBUG, collectstatic writes content-hashed bundle names plus .gz/.br
+# siblings (brotli only if the package is installed), and templates link to
+# the hashed names so browsers can cache them for a year.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'filemanager.utils.staticfiles.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Caches
+# "user_data" holds per-user query results (note text only as ciphertext). It
+# is kept in process memory, LRU-culled at MAX_ENTRIES. "shared" is visible to every worker process and holds the
+# share link mappings. The per-user generation counters used to invalidate
+# "user_data" are kept in USER_GENERATION_DB, which supports atomic bumps.
+# The test runner points all of these at a temporary directory.
+CACHE_DIR = Path(os.environ.get('SECUREVAULT_CACHE_DIR', BASE_DIR / '.cache'))
+USER_GENERATION_DB = CACHE_DIR / 'generations.sqlite3'
+TEST_RUNNER = 'securevault.test_runner.TestRunner'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'user_data': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'securevault-user-data',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'shared',
+        'TIMEOUT': None,
+    },
+}
+
+# Upload admission control (see filemanager/utils/admission.py for defaults).
+# Limiter state is shared by all worker processes through this SQLite file.
+UPLOAD_ADMISSION = {
+    'DB_PATH': CACHE_DIR / 'admission.sqlite3',
+    'USER_REQUESTS_PER_SECOND': 2.0,
+    'USER_REQUEST_BURST': 10,
+    'USER_BYTES_PER_SECOND': 10 * 1024 * 1024,
+    'USER_BYTE_BURST': 100 * 1024 * 1024,
+    'MAX_CONCURRENT_UPLOADS': 8,
+    'QUEUE_SIZE': 16,
+    'QUEUE_TIMEOUT': 10.0,
+}
+
+# Tombstones older than this are dropped by `manage.py prune_changelog`; sync
+# clients with an older cursor get 410 and resync from scratch.
+CHANGELOG_RETENTION_DAYS = 90
+
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'notes_list'
 LOGOUT_REDIRECT_URL = 'login'
@@ -0,0 +1,33 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Keep the caches and limiter state written by tests out of the source tree."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="securevault-tests-"))
+        caches = {**settings.CACHES}
+        caches["shared"] = {**caches["shared"], "LOCATION": self.cache_dir / "shared"}
+        # Generation bumps run on commit, which TestCase never reaches, and
+        # user ids repeat between tests; tests of the per-user cache opt back
+        # in with override_settings(CACHES=...).
+        caches["user_data"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        self.cache_overrides = override_settings(
+            CACHE_DIR=self.cache_dir,
+            CACHES=caches,
+            USER_GENERATION_DB=self.cache_dir / "generations.sqlite3",
+            UPLOAD_ADMISSION={**settings.UPLOAD_ADMISSION, "DB_PATH": self.cache_dir / "admission.sqlite3"},
+        )
+        self.cache_overrides.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_overrides.disable()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
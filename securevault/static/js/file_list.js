@@ -0,0 +1,162 @@
+let selectedFiles = new Set();
+
+function toggleView() { console.log('Toggle view placeholder'); }
+
+function toggleSelectAll() {
+    const selectAll = document.getElementById('selectAll');
+    const checkboxes = document.querySelectorAll('.file-checkbox:not(#selectAll)');
+    checkboxes.forEach(cb => cb.checked = selectAll.checked);
+    updateSelection();
+}
+
+function updateSelection() {
+    const checkboxes = document.querySelectorAll('.file-checkbox:not(#selectAll):checked');
+    selectedFiles.clear();
+    checkboxes.forEach(cb => selectedFiles.add(cb.value));
+
+    const bulk = document.getElementById('bulkActions');
+    const count = document.getElementById('selectedCount');
+    if (selectedFiles.size > 0) {
+        bulk.style.display = 'block';
+        count.textContent = selectedFiles.size;
+    } else {
+        bulk.style.display = 'none';
+    }
+}
+
+function clearSelection() {
+    document.querySelectorAll('.file-checkbox').forEach(cb => cb.checked = false);
+    updateSelection();
+}
+
+function bulkDownload() {
+    if (!selectedFiles.size) return;
+    selectedFiles.forEach(id => {
+        const a = document.createElement('a');
+        a.href = `/files/${id}/download/`;
+        document.body.appendChild(a);
+        a.click();
+        a.remove();
+    });
+    showNotification(`Downloading ${selectedFiles.size} files`, 'success');
+}
+
+function bulkDelete() {
+    if (!selectedFiles.size) return;
+    if (!confirm(`Delete ${selectedFiles.size} selected file(s)? This cannot be undone.`)) return;
+
+    const form = document.getElementById('bulkDeleteForm');
+    const inputs = document.getElementById('bulkDeleteInputs');
+    inputs.innerHTML = '';
+    selectedFiles.forEach(id => {
+        const inp = document.createElement('input');
+        inp.type = 'hidden';
+        inp.name = 'file_ids';
+        inp.value = id;
+        inputs.appendChild(inp);
+    });
+    form.submit();
+}
+
+function previewFile(fileId, fileType, fileName) {
+    showNotification('Preview would open here (implement modal if needed)', 'info');
+}
+
+function shareFile(fileId) {
+    const csrf = document.querySelector('#bulkDeleteForm [name=csrfmiddlewaretoken]').value;
+    fetch(`/files/${fileId}/share/`, {method: 'POST', headers: {'X-CSRFToken': csrf}})
+        .then(r => r.json())
+        .then(data => {
+            if (!data.success) throw new Error();
+            const expires = new Date(data.expires * 1000).toLocaleString();
+            if (navigator.clipboard) navigator.clipboard.writeText(data.url);
+            showNotification(`Share link copied (valid until ${expires}):<br><small>${data.url}</small>`, 'success');
+        })
+        .catch(() => showNotification('Could not create share link', 'error'));
+}
+
+function sortFiles(criteria) {
+    const url = new URL(window.location);
+    url.searchParams.set('sort', criteria);
+    window.location.href = url.toString();
+}
+
+function showNotification(message, type) {
+    const n = document.createElement('div');
+    n.style.cssText = `
+        position: fixed; top: 20px; right: 20px; z-index: 9999;
+        min-width: 300px; padding: 15px 20px; border-radius: 10px;
+        color: white; font-weight: 500; box-shadow: 0 4px 20px rgba(0,0,0,.3);
+        animation: slideIn .3s ease;
+    `;
+    n.style.background = type === 'success'
+        ? 'linear-gradient(135deg,#48bb78,#38a169)'
+        : type === 'error'
+          ? 'linear-gradient(135deg,#fc8181,#f56565)'
+          : 'linear-gradient(135deg,#4fd1c7,#81e6d9)';
+    if (type !== 'success' && type !== 'error') n.style.color = '#0f1419';
+    n.innerHTML = `${message}<button onclick="this.parentElement.remove()" style="background:none;border:none;color:inherit;float:right;font-size:18px;cursor:pointer;margin-left:10px;">×</button>`;
+    document.body.appendChild(n);
+    setTimeout(() => n.remove(), 5000);
+}
+
+const style = document.createElement('style');
+style.textContent = `@keyframes slideIn{from{transform:translateX(100%);opacity:0}to{transform:translateX(0);opacity:1}}`;
+document.head.appendChild(style);
+
+function showNotification(message, type) {
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        z-index: 9999;
+        min-width: 300px;
+        padding: 15px 20px;
+        border-radius: 10px;
+        color: white;
+        font-weight: 500;
+        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
+        animation: slideIn 0.3s ease;
+    `;
+
+    if (type === 'success') {
+        notification.style.background = 'linear-gradient(135deg, #48bb78, #38a169)';
+    } else if (type === 'error') {
+        notification.style.background = 'linear-gradient(135deg, #fc8181, #f56565)';
+    } else {
+        notification.style.background = 'linear-gradient(135deg, #4fd1c7, #81e6d9)';
+        notification.style.color = '#0f1419';
+    }
+
+    notification.innerHTML = `
+        ${message}
+        <button onclick="this.parentElement.remove()" style="
+            background: none;
+            border: none;
+            color: inherit;
+            float: right;
+            font-size: 18px;
+            cursor: pointer;
+            margin-left: 10px;
+        ">×</button>
+    `;
+
+    document.body.appendChild(notification);
+
+    setTimeout(() => {
+        if (notification.parentElement) {
+            notification.remove();
+        }
+    }, 5000);
+}
+
+// Add CSS animation
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+`;
+document.head.appendChild(style);
@@ -0,0 +1,48 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const contentTextarea = document.getElementById('id_content');
+
+    // Update word/character count
+    contentTextarea.addEventListener('input', updateCounts);
+    updateCounts();
+
+    // Keyboard shortcuts
+    contentTextarea.addEventListener('keydown', function(e) {
+        if (e.ctrlKey || e.metaKey) {
+            switch(e.key) {
+                case 'b':
+                    e.preventDefault();
+                    insertMarkdown('**', '**');
+                    break;
+                case 'i':
+                    e.preventDefault();
+                    insertMarkdown('*', '*');
+                    break;
+            }
+        }
+    });
+});
+
+function updateCounts() {
+    const content = document.getElementById('id_content').value;
+    const charCount = content.length;
+    const wordCount = content.trim() ? content.trim().split(/\s+/).length : 0;
+
+    document.getElementById('charCount').textContent = charCount.toLocaleString();
+    document.getElementById('wordCount').textContent = wordCount.toLocaleString();
+}
+
+function insertMarkdown(before, after) {
+    const textarea = document.getElementById('id_content');
+    const start = textarea.selectionStart;
+    const end = textarea.selectionEnd;
+    const selectedText = textarea.value.substring(start, end);
+
+    const newText = before + selectedText + after;
+    textarea.value = textarea.value.substring(0, start) + newText + textarea.value.substring(end);
+
+    const newCursorPos = start + before.length + selectedText.length;
+    textarea.setSelectionRange(newCursorPos, newCursorPos);
+    textarea.focus();
+
+    updateCounts();
+}
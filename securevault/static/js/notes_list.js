@@ -0,0 +1,77 @@
+function toggleNotesView() {
+    const gridView = document.getElementById('notesGridView');
+    const listView = document.getElementById('notesListView');
+    const viewIcon = document.getElementById('notesViewIcon');
+    const viewText = document.getElementById('notesViewText');
+    const viewIcon2 = document.getElementById('notesViewIcon2');
+    const viewText2 = document.getElementById('notesViewText2');
+
+    if (gridView.style.display === 'none' || gridView.style.display === '') {
+        gridView.style.display = 'grid';
+        listView.style.display = 'none';
+        viewIcon.className = 'fas fa-list';
+        viewText.textContent = 'List View';
+        viewIcon2.className = 'fas fa-list';
+        viewText2.textContent = 'List View';
+    } else {
+        gridView.style.display = 'none';
+        listView.style.display = 'flex';
+        viewIcon.className = 'fas fa-th';
+        viewText.textContent = 'Grid View';
+        viewIcon2.className = 'fas fa-th';
+        viewText2.textContent = 'Grid View';
+    }
+}
+
+function toggleDropdown(noteId) {
+    document.querySelectorAll('.note-dropdown').forEach(d => {
+        if (d.id !== 'dropdown-' + noteId) d.classList.remove('show');
+    });
+    const dropdown = document.getElementById('dropdown-' + noteId);
+    if (dropdown) dropdown.classList.toggle('show');
+}
+
+function openNote(noteId) {
+    window.location.href = '/notes/edit/' + noteId + '/';
+}
+
+document.addEventListener('click', function(e) {
+    if (!e.target.closest('.note-menu')) {
+        document.querySelectorAll('.note-dropdown').forEach(d => d.classList.remove('show'));
+    }
+});
+
+function enhanceSearch() {
+    const input = document.querySelector('.search-input');
+    if (!input) return;
+
+    let t;
+    input.addEventListener('input', function() {
+        clearTimeout(t);
+        t = setTimeout(() => {
+            const q = this.value.toLowerCase();
+            const gridNotes = document.querySelectorAll('#notesGridView .note-card');
+            const listNotes = document.querySelectorAll('#notesListView .note-list-item');
+
+            gridNotes.forEach(n => {
+                const title = n.querySelector('.note-title')?.textContent.toLowerCase() || '';
+                const content = n.querySelector('.note-content')?.textContent.toLowerCase() || '';
+                n.style.display = (!q || title.includes(q) || content.includes(q)) ? '' : 'none';
+                if (n.style.display !== 'none') n.style.animation = 'fadeIn .3s ease';
+            });
+
+            listNotes.forEach(n => {
+                const title = n.querySelector('.note-list-title')?.textContent.toLowerCase() || '';
+                const content = n.querySelector('.note-list-text')?.textContent.toLowerCase() || '';
+                n.style.display = (!q || title.includes(q) || content.includes(q)) ? '' : 'none';
+                if (n.style.display !== 'none') n.style.animation = 'fadeIn .3s ease';
+            });
+        }, 300);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', enhanceSearch);
+
+const style = document.createElement('style');
+style.textContent = `@keyframes fadeIn{from{opacity:0;transform:translateY(10px)}to{opacity:1;transform:translateY(0)}}`;
+document.head.appendChild(style);
@@ -0,0 +1,53 @@
+// Form enhancement
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('form');
+    const submitBtn = document.querySelector('.reset-btn');
+    const emailInput = document.getElementById('id_email');
+
+    form.addEventListener('submit', function(e) {
+        const email = emailInput.value.trim();
+
+        if (!email) {
+            e.preventDefault();
+            emailInput.classList.add('error');
+            showError('Please enter your email address');
+            return;
+        }
+
+        if (!isValidEmail(email)) {
+            e.preventDefault();
+            emailInput.classList.add('error');
+            showError('Please enter a valid email address');
+            return;
+        }
+
+        // Show loading state
+        submitBtn.disabled = true;
+        submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Sending...';
+    });
+
+    emailInput.addEventListener('input', function() {
+        this.classList.remove('error');
+        removeError();
+    });
+
+    function isValidEmail(email) {
+        const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+        return emailRegex.test(email);
+    }
+
+    function showError(message) {
+        removeError();
+        const errorDiv = document.createElement('div');
+        errorDiv.className = 'error-message';
+        errorDiv.innerHTML = `<i class="fas fa-exclamation-triangle"></i><span>${message}</span>`;
+        emailInput.closest('.form-group').appendChild(errorDiv);
+    }
+
+    function removeError() {
+        const existingError = document.querySelector('.error-message');
+        if (existingError) {
+            existingError.remove();
+        }
+    }
+});
@@ -0,0 +1,41 @@
+function checkPasswordStrength(password) {
+    const strengthBar = document.getElementById('strengthBar');
+    const strengthText = document.getElementById('strengthText');
+
+    let strength = 0;
+    let feedback = '';
+
+    // Check length
+    if (password.length >= 8) strength += 1;
+    if (password.length >= 12) strength += 1;
+
+    // Check character types
+    if (/[a-z]/.test(password)) strength += 1;
+    if (/[A-Z]/.test(password)) strength += 1;
+    if (/[0-9]/.test(password)) strength += 1;
+    if (/[^A-Za-z0-9]/.test(password)) strength += 1;
+
+    // Set strength level
+    strengthBar.className = 'strength-bar';
+
+    if (password.length === 0) {
+        strengthBar.style.width = '0%';
+        strengthText.textContent = '';
+    } else if (strength <= 2) {
+        strengthBar.classList.add('strength-weak');
+        strengthText.textContent = 'Weak password';
+        strengthText.style.color = '#fc8181';
+    } else if (strength <= 3) {
+        strengthBar.classList.add('strength-fair');
+        strengthText.textContent = 'Fair password';
+        strengthText.style.color = '#fbd38d';
+    } else if (strength <= 4) {
+        strengthBar.classList.add('strength-good');
+        strengthText.textContent = 'Good password';
+        strengthText.style.color = '#68d391';
+    } else {
+        strengthBar.classList.add('strength-strong');
+        strengthText.textContent = 'Strong password';
+        strengthText.style.color = '#48bb78';
+    }
+}
@@ -0,0 +1,298 @@
+// Endpoints come from data attributes on this script's tag
+const uploadUrls = document.currentScript.dataset;
+
+let uploadQueue = [];
+let uploading = false;
+
+// Initialize upload functionality
+document.addEventListener('DOMContentLoaded', function() {
+    const dropZone = document.getElementById('dropZone');
+    const fileInput = document.getElementById('fileInput');
+
+    // Drag and drop events
+    dropZone.addEventListener('dragover', handleDragOver);
+    dropZone.addEventListener('dragleave', handleDragLeave);
+    dropZone.addEventListener('drop', handleDrop);
+    dropZone.addEventListener('click', () => fileInput.click());
+
+    // File input change
+    fileInput.addEventListener('change', handleFileSelect);
+
+    // Prevent default drag behaviors on the whole document
+    document.addEventListener('dragover', (e) => e.preventDefault());
+    document.addEventListener('drop', (e) => e.preventDefault());
+});
+
+function handleDragOver(e) {
+    e.preventDefault();
+    e.stopPropagation();
+    e.currentTarget.classList.add('drag-over');
+}
+
+function handleDragLeave(e) {
+    e.preventDefault();
+    e.stopPropagation();
+    e.currentTarget.classList.remove('drag-over');
+}
+
+function handleDrop(e) {
+    e.preventDefault();
+    e.stopPropagation();
+    e.currentTarget.classList.remove('drag-over');
+
+    const files = Array.from(e.dataTransfer.files);
+    addFilesToQueue(files);
+}
+
+function handleFileSelect(e) {
+    const files = Array.from(e.target.files);
+    addFilesToQueue(files);
+
+    // Clear the input so the same file can be selected again
+    e.target.value = '';
+}
+
+function addFilesToQueue(files) {
+    files.forEach(file => {
+        // Check file size (50MB limit)
+        if (file.size > 50 * 1024 * 1024) {
+            showNotification(`File ${file.name} is too large (max 50MB)`, 'error');
+            return;
+        }
+
+        const fileId = Date.now() + Math.random();
+        uploadQueue.push({
+            id: fileId,
+            file: file,
+            status: 'queued'
+        });
+    });
+
+    updateQueueDisplay();
+}
+
+function updateQueueDisplay() {
+    const queueDiv = document.getElementById('uploadQueue');
+    const queueList = document.getElementById('queueList');
+
+    if (uploadQueue.length === 0) {
+        queueDiv.style.display = 'none';
+        return;
+    }
+
+    queueDiv.style.display = 'block';
+
+    queueList.innerHTML = uploadQueue.map(item => `
+        <div class="queue-item">
+            <div class="queue-file-info">
+                <div class="queue-file-icon">
+                    <i class="fas fa-file"></i>
+                </div>
+                <div class="queue-file-details">
+                    <div class="queue-file-name">${item.file.name}</div>
+                    <div class="queue-file-size">${formatFileSize(item.file.size)}</div>
+                </div>
+            </div>
+            <div class="queue-actions">
+                <span class="queue-status">${item.status}</span>
+                <button class="remove-btn" onclick="removeFromQueue('${item.id}')">
+                    <i class="fas fa-times"></i>
+                </button>
+            </div>
+        </div>
+    `).join('');
+}
+
+function removeFromQueue(fileId) {
+    uploadQueue = uploadQueue.filter(item => item.id != fileId);
+    updateQueueDisplay();
+}
+
+function clearQueue() {
+    uploadQueue = [];
+    updateQueueDisplay();
+}
+
+async function startUpload() {
+    if (uploading || uploadQueue.length === 0) return;
+
+    uploading = true;
+    const progressDiv = document.getElementById('uploadProgress');
+    const progressBars = document.getElementById('progressBars');
+
+    progressDiv.style.display = 'block';
+    progressBars.innerHTML = '';
+
+    let successCount = 0;
+
+    for (let item of uploadQueue) {
+        const success = await uploadFile(item);
+        if (success) successCount++;
+    }
+
+    uploading = false;
+    uploadQueue = [];
+    updateQueueDisplay();
+
+    setTimeout(() => {
+        progressDiv.style.display = 'none';
+    }, 3000);
+
+    showNotification(`${successCount} files uploaded successfully!`, 'success');
+
+    // Redirect to file list after successful upload
+    setTimeout(() => {
+        window.location.href = uploadUrls.fileListUrl;
+    }, 2000);
+}
+
+async function uploadFile(item) {
+    const formData = new FormData();
+    formData.append('file', item.file);
+    formData.append('csrfmiddlewaretoken', document.querySelector('[name=csrfmiddlewaretoken]').value);
+
+    // Create progress bar
+    const progressId = `progress-${item.id}`;
+    const progressHTML = `
+        <div class="progress-item">
+            <div class="progress-header">
+                <span class="progress-filename">${item.file.name}</span>
+                <span id="${progressId}-percent" class="progress-percent">0%</span>
+            </div>
+            <div class="progress-bar-container">
+                <div id="${progressId}" class="progress-bar"></div>
+            </div>
+        </div>
+    `;
+
+    document.getElementById('progressBars').innerHTML += progressHTML;
+
+    try {
+        // Simulate progress
+        const progressBar = document.getElementById(progressId);
+        const progressPercent = document.getElementById(progressId + '-percent');
+
+        // Start upload
+        const uploadPromise = fetch(uploadUrls.uploadUrl, {
+            method: 'POST',
+            body: formData,
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        });
+
+        // Simulate progress animation
+        for (let i = 0; i <= 90; i += 10) {
+            progressBar.style.width = i + '%';
+            progressPercent.textContent = i + '%';
+            await new Promise(resolve => setTimeout(resolve, 100));
+        }
+
+        const response = await uploadPromise;
+
+        // Complete the progress bar
+        progressBar.style.width = '100%';
+        progressPercent.textContent = '100%';
+
+        if (response.ok) {
+            // Check if response is JSON
+            const contentType = response.headers.get('content-type');
+            if (contentType && contentType.includes('application/json')) {
+                const result = await response.json();
+                if (result.success) {
+                    progressBar.style.background = 'linear-gradient(90deg, #48bb78, #38a169)';
+                    return true;
+                } else {
+                    throw new Error(result.message || 'Upload failed');
+                }
+            } else {
+                // If not JSON, assume success (redirect response)
+                progressBar.style.background = 'linear-gradient(90deg, #48bb78, #38a169)';
+                return true;
+            }
+        } else {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+
+    } catch (error) {
+        console.error('Upload error:', error);
+        document.getElementById(progressId).style.background = 'linear-gradient(90deg, #fc8181, #f56565)';
+        showNotification(`Failed to upload ${item.file.name}: ${error.message}`, 'error');
+        return false;
+    }
+}
+
+function formatFileSize(bytes) {
+    if (bytes === 0) return '0 B';
+    const k = 1024;
+    const sizes = ['B', 'KB', 'MB', 'GB'];
+    const i = Math.floor(Math.log(bytes) / Math.log(k));
+    return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i];
+}
+
+function showNotification(message, type) {
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        z-index: 9999;
+        min-width: 300px;
+        padding: 15px 20px;
+        border-radius: 15px;
+        color: white;
+        font-weight: 500;
+        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
+        animation: slideInRight 0.3s ease;
+        backdrop-filter: blur(20px);
+    `;
+
+    if (type === 'success') {
+        notification.style.background = 'linear-gradient(135deg, #48bb78, #38a169)';
+    } else if (type === 'error') {
+        notification.style.background = 'linear-gradient(135deg, #fc8181, #f56565)';
+    } else {
+        notification.style.background = 'linear-gradient(135deg, #4fd1c7, #81e6d9)';
+        notification.style.color = '#0f1419';
+    }
+
+    notification.innerHTML = `
+        <div style="display: flex; align-items: center; justify-content: space-between;">
+            <span>${message}</span>
+            <button onclick="this.parentElement.parentElement.remove()" style="
+                background: none;
+                border: none;
+                color: inherit;
+                font-size: 18px;
+                cursor: pointer;
+                margin-left: 15px;
+                padding: 5px;
+                border-radius: 5px;
+                transition: background 0.3s ease;
+            " onmouseover="this.style.background='rgba(0,0,0,0.1)'" onmouseout="this.style.background='none'">×</button>
+        </div>
+    `;
+
+    document.body.appendChild(notification);
+
+    setTimeout(() => {
+        if (notification.parentElement) {
+            notification.style.animation = 'slideOutRight 0.3s ease';
+            setTimeout(() => notification.remove(), 300);
+        }
+    }, 5000);
+}
+
+// Add CSS animations
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideInRight {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOutRight {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+document.head.appendChild(style);